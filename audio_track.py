@@ -0,0 +1,92 @@
+"""
+Background Audio Track
+Loops, trims and encodes the background music to AAC once per
+(source file, duration), so renders can mux it in by stream copy
+"""
+
+import hashlib
+import os
+
+import video_config
+import video_segments
+import cache_eviction
+
+
+def file_digest(filename):
+    """Return the SHA-256 hex digest of a file's contents."""
+    digest = hashlib.sha256()
+    with open(filename, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def prepare_soundtrack(source, duration, cache_dir=None):
+    """
+    Return an AAC track of the source looped and trimmed to duration.
+
+    The track is encoded on the first request and reused from the cache
+    afterwards; a hit refreshes the file's modification time, which
+    eviction orders by.
+
+    Args:
+        source: Audio file to loop (any format ffmpeg can decode)
+        duration: Track length in seconds
+        cache_dir: Cache directory (defaults to video_config.AUDIO_CACHE_DIR)
+
+    Returns:
+        str: Path of the encoded .m4a track
+    """
+    if cache_dir is None:
+        cache_dir = video_config.AUDIO_CACHE_DIR
+
+    key = f"{file_digest(source)[:32]}_{duration:g}s_{video_config.AUDIO_BITRATE}"
+    path = os.path.join(cache_dir, key + ".m4a")
+    if os.path.exists(path):
+        os.utime(path)
+        return path
+
+    os.makedirs(cache_dir, exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp.m4a"
+    video_segments.run_ffmpeg([
+        "-stream_loop", "-1",
+        "-i", source,
+        "-t", f"{duration:g}",
+        "-vn",
+        "-c:a", "aac",
+        "-b:a", video_config.AUDIO_BITRATE,
+        tmp_path,
+    ])
+    os.replace(tmp_path, path)
+    return path
+
+
+def evict(max_bytes=None, cache_dir=None):
+    """
+    Remove least recently used tracks until the cache fits in max_bytes.
+
+    Returns:
+        int: Number of tracks removed
+    """
+    if max_bytes is None:
+        max_bytes = video_config.AUDIO_CACHE_MAX_BYTES
+    if cache_dir is None:
+        cache_dir = video_config.AUDIO_CACHE_DIR
+    return cache_eviction.evict_lru(cache_dir, max_bytes)[0]
+
+
+def background_track(duration):
+    """
+    Prepare the configured background music for a video.
+
+    Returns:
+        str: Path of the encoded track, or None if audio is disabled or fails
+    """
+    if not (video_config.AUDIO and video_config.AUDIO_FILENAME):
+        return None
+    print(f"\nAdding background music: {video_config.AUDIO_FILENAME}")
+    try:
+        return prepare_soundtrack(video_config.AUDIO_FILENAME, duration)
+    except Exception as e:
+        print(f"Warning: Could not add background music: {e}")
+        return None
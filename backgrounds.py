@@ -0,0 +1,73 @@
+"""
+Slide Backgrounds
+Builds slide background images with vectorized NumPy operations and
+memoizes them, since every slide uses the same size and colors
+"""
+
+from functools import lru_cache
+
+import numpy as np
+
+import video_config
+
+STYLES = ("linear", "diagonal", "radial", "solid")
+
+
+def _blend(ratio, start, end):
+    """Interpolate between two colors for every value in a ratio array."""
+    start = np.asarray(start, dtype=np.float64)
+    end = np.asarray(end, dtype=np.float64)
+    ratio = ratio[..., np.newaxis]
+    return (start * (1 - ratio) + end * ratio).astype(np.uint8)
+
+
+@lru_cache(maxsize=16)
+def _build_background(width, height, style, start, end):
+    if style == "linear":
+        # Top to bottom, one color per row broadcast across the width
+        rows = _blend(np.arange(height) / height, start, end)
+        image = np.broadcast_to(rows[:, np.newaxis, :], (height, width, 3)).copy()
+    elif style == "diagonal":
+        # Top-left to bottom-right
+        y = np.arange(height)[:, np.newaxis] / height
+        x = np.arange(width)[np.newaxis, :] / width
+        image = _blend((x + y) / 2, start, end)
+    elif style == "radial":
+        # Start color in the center fading to the end color at the corners
+        y = (np.arange(height)[:, np.newaxis] - height / 2) / (height / 2)
+        x = (np.arange(width)[np.newaxis, :] - width / 2) / (width / 2)
+        ratio = np.minimum(np.sqrt(x * x + y * y) / np.sqrt(2), 1.0)
+        image = _blend(ratio, start, end)
+    elif style == "solid":
+        image = np.empty((height, width, 3), dtype=np.uint8)
+        image[:] = start
+    else:
+        raise ValueError(f"Unknown background style: {style} (expected one of {', '.join(STYLES)})")
+
+    image.setflags(write=False)
+    return image
+
+
+def get_background(width, height, style="linear", start=(0, 0, 0), end=(0, 0, 0)):
+    """
+    Return a background image, building it only the first time it is requested.
+
+    Args:
+        width: Image width
+        height: Image height
+        style: "linear", "diagonal", "radial" or "solid"
+        start: RGB start color (the only color for "solid")
+        end: RGB end color
+
+    Returns:
+        numpy.ndarray: Read-only uint8 array of shape (height, width, 3)
+    """
+    return _build_background(int(width), int(height), style, tuple(start), tuple(end))
+
+
+def slide_background(width, height):
+    """Return the slide background in the style and colors set in video_config."""
+    style = video_config.BACKGROUND_STYLE
+    if style == "solid":
+        return get_background(width, height, style, video_config.BACKGROUND_COLOR)
+    return get_background(width, height, style, video_config.GRADIENT_START, video_config.GRADIENT_END)
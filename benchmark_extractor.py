@@ -0,0 +1,195 @@
+"""
+Extractor Benchmark
+Times extract_product_info over synthetic PA API items, in both response
+shapes (dicts and SDK-style attribute objects), against the original
+get_val implementation, and checks both produce the same products.
+
+Usage:
+    python benchmark_extractor.py
+    python benchmark_extractor.py --items 100000 --repeat 5
+"""
+
+import argparse
+import json
+import time
+from types import SimpleNamespace
+
+from fake_paapi import fake_item
+from fetch_amazon_deals import extract_product_info
+
+
+def legacy_extract_product_info(item, require_title=True):
+    """
+    The per-field get_val implementation the extractor replaced, kept as
+    the benchmark baseline.
+    
+    Args:
+        item: AmazonProduct object or dictionary from API response
+        require_title: Drop items without a title (off for price-only responses)
+        
+    Returns:
+        dict: Formatted product information
+    """
+    try:
+        # Helper to get value from either object attribute or dictionary key
+        def get_val(obj, key, default=None):
+            if isinstance(obj, dict):
+                return obj.get(key, default)
+            return getattr(obj, key, default)
+
+        product = {
+            "asin": get_val(item, 'asin'),
+            "title": None,
+            "current_price": None,
+            "original_price": None,
+            "savings": None,
+            "savings_percentage": None,
+            "currency": None,
+            "is_prime_eligible": False,
+            "promotions": [],
+            "image_url": None,
+            "product_url": get_val(item, 'detail_page_url')
+        }
+        
+        # Extract title
+        item_info = get_val(item, 'item_info')
+        if item_info:
+            title_obj = get_val(item_info, 'title')
+            if title_obj:
+                product["title"] = get_val(title_obj, 'display_value')
+        
+        # Extract image
+        images = get_val(item, 'images')
+        if images:
+            primary = get_val(images, 'primary')
+            if primary:
+                large = get_val(primary, 'large')
+                if large:
+                    product["image_url"] = get_val(large, 'url')
+        
+        # Extract pricing and deal information
+        offers = get_val(item, 'offers')
+        if offers:
+            listings = get_val(offers, 'listings')
+            if listings and len(listings) > 0:
+                listing = listings[0]
+                
+                # Current price
+                price = get_val(listing, 'price')
+                if price:
+                    product["current_price"] = get_val(price, 'display_amount')
+                    product["currency"] = get_val(price, 'currency')
+                
+                # Original price (savings basis)
+                saving_basis = get_val(listing, 'saving_basis')
+                if saving_basis:
+                    product["original_price"] = get_val(saving_basis, 'display_amount')
+                    
+                    # Calculate savings
+                    if price:
+                        price_amount = get_val(price, 'amount')
+                        basis_amount = get_val(saving_basis, 'amount')
+                        if price_amount is not None and basis_amount is not None:
+                            try:
+                                savings_amount = basis_amount - price_amount
+                                if basis_amount > 0:
+                                    savings_pct = (savings_amount / basis_amount) * 100
+                                    currency_symbol = product["currency"] if product["currency"] else "USD"
+                                    product["savings"] = f"{currency_symbol} {savings_amount:.2f}"
+                                    product["savings_percentage"] = f"{savings_pct:.0f}%"
+                            except:
+                                pass
+                
+                # Prime eligibility
+                delivery_info = get_val(listing, 'delivery_info')
+                if delivery_info:
+                    product["is_prime_eligible"] = get_val(delivery_info, 'is_prime_eligible', False)
+                
+                # Promotions
+                promotions = get_val(listing, 'promotions')
+                if promotions:
+                    for promo in promotions:
+                        promo_info = {
+                            "type": get_val(promo, 'type', "Unknown"),
+                            "discount": f"{get_val(promo, 'discount_percent')}%" if get_val(promo, 'discount_percent') else None
+                        }
+                        if promo_info["type"]:
+                            product["promotions"].append(promo_info)
+        
+        # Return product even if no savings, since we want books, toys etc as well
+        # But filter out those without a title or ASIN
+        if product["asin"] and (product["title"] or not require_title):
+            return product
+        
+        return None
+        
+    except Exception as e:
+        print(f"Error extracting product info: {e}")
+        return None
+
+
+def make_items(count):
+    """Build synthetic items, some with promotions and some without listings."""
+    items = []
+    for i in range(count):
+        item = fake_item(f"B{i:09d}", "Books")
+        if i % 7 == 0:
+            item["offers"]["listings"][0]["promotions"] = [{"type": "Coupon", "discount_percent": 10}]
+        if i % 50 == 0:
+            item["offers"] = None
+        items.append(item)
+    return items
+
+
+def to_objects(value):
+    """Convert nested dicts to attribute objects, like the SDK's models."""
+    if isinstance(value, dict):
+        return SimpleNamespace(**{key: to_objects(v) for key, v in value.items()})
+    if isinstance(value, list):
+        return [to_objects(v) for v in value]
+    return value
+
+
+def time_extract(extract, items, repeat):
+    """Return the best wall time of extracting every item, over repeat runs."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for item in items:
+            extract(item)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(description="Benchmark PA API item extraction.")
+    parser.add_argument("--items", type=int, default=100000, help="Synthetic items per shape")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per case (best is reported)")
+    args = parser.parse_args()
+
+    dict_items = make_items(args.items)
+    shapes = {"dict": dict_items, "object": [to_objects(item) for item in dict_items]}
+
+    results = []
+    for shape, items in shapes.items():
+        for item in items[:1000]:
+            if extract_product_info(item) != legacy_extract_product_info(item):
+                raise SystemExit(f"Extractors disagree on {shape} item: {item}")
+        legacy = time_extract(legacy_extract_product_info, items, args.repeat)
+        fast = time_extract(extract_product_info, items, args.repeat)
+        results.append({
+            "shape": shape,
+            "items": len(items),
+            "legacy_seconds": round(legacy, 4),
+            "fast_seconds": round(fast, 4),
+            "legacy_us_per_item": round(legacy / len(items) * 1e6, 3),
+            "fast_us_per_item": round(fast / len(items) * 1e6, 3),
+            "speedup": round(legacy / fast, 2),
+        })
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
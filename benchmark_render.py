@@ -0,0 +1,224 @@
+"""
+Render Benchmark
+Generates synthetic product catalogs and measures how render time,
+frames per second and peak memory scale with product count, resolution,
+render mode and encoder profile. Results are printed as JSON.
+
+Usage:
+    python benchmark_render.py
+    python benchmark_render.py --sizes 10 50 --resolutions 1280x720 1920x1080 --output bench.json
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+WORDS = [
+    "Complete", "Guide", "Practice", "Tests", "Edition", "Updated", "Workbook",
+    "Secrets", "Mastery", "Illustrated", "Collection", "Novel", "Mystery", "Romance",
+    "Science", "History", "Cookbook", "Essential", "Handbook", "Series", "Volume",
+]
+
+
+def make_title(rng, long_title):
+    """Make a random book-like title, optionally well past the truncation limit."""
+    count = rng.randint(25, 40) if long_title else rng.randint(3, 8)
+    return " ".join(rng.choice(WORDS) for _ in range(count))
+
+
+def make_catalog(size, seed=0):
+    """
+    Build a synthetic products.json payload.
+
+    The catalog mixes long and short titles, products with and without
+    savings and Prime and non-Prime items.
+
+    Args:
+        size: Number of products
+        seed: Random seed so runs are comparable
+
+    Returns:
+        dict: Data in the products.json format
+    """
+    rng = random.Random(seed)
+    products = []
+    for i in range(size):
+        price = rng.randint(299, 9999) / 100
+        product = {
+            "asin": f"B{i:09d}",
+            "title": make_title(rng, long_title=(i % 3 == 0)),
+            "current_price": f"${price:.2f}",
+            "original_price": None,
+            "savings": None,
+            "savings_percentage": None,
+            "currency": "USD",
+            "is_prime_eligible": i % 2 == 0,
+            "promotions": [],
+            "image_url": None,
+            "product_url": f"https://www.amazon.com/dp/B{i:09d}",
+        }
+        # Roughly a quarter of the products have no savings
+        if i % 4 != 0:
+            basis = round(price * rng.uniform(1.1, 2.5), 2)
+            savings = basis - price
+            product["original_price"] = f"${basis:.2f}"
+            product["savings"] = f"USD {savings:.2f}"
+            product["savings_percentage"] = f"{savings / basis * 100:.0f}%"
+        products.append(product)
+
+    return {
+        "fetch_timestamp": datetime.now().isoformat(),
+        "total_deals": len(products),
+        "products": products,
+    }
+
+
+def run_case(case):
+    """
+    Render one benchmark case in the current process.
+
+    Args:
+        case: Dict with catalog, output, width, height, mode, profile, cache_dir, warm
+
+    Returns:
+        dict: Timings, throughput and peak memory for the case
+    """
+    import video_config
+    video_config.VIDEO_WIDTH = case["width"]
+    video_config.VIDEO_HEIGHT = case["height"]
+    video_config.ENCODER_PROFILE = case["profile"]
+    video_config.SEGMENT_CACHE = case["warm"]
+    video_config.SEGMENT_CACHE_DIR = os.path.join(case["cache_dir"], "segments")
+    video_config.TEXT_CACHE_DIR = os.path.join(case["cache_dir"], "text")
+    video_config.AUDIO_CACHE_DIR = os.path.join(case["cache_dir"], "audio")
+    video_config.COVER_CACHE_DIR = os.path.join(case["cache_dir"], "covers")
+
+    from create_deals_video import create_deals_video, load_deals
+    import slide_layout
+
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        stages = create_deals_video(case["catalog"], case["output"], render_mode=case["mode"])
+    elapsed = time.perf_counter() - start
+
+    deals = load_deals(case["catalog"])
+    products = len(deals)
+    duration = slide_layout.video_duration(deals)
+    frames = duration * video_config.FPS
+
+    # ru_maxrss is in kilobytes on Linux
+    self_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    child_rss = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+
+    return {
+        "products": products,
+        "resolution": f"{case['width']}x{case['height']}",
+        "mode": case["mode"],
+        "profile": case["profile"],
+        "warm_cache": case["warm"],
+        "seconds": round(elapsed, 3),
+        "video_seconds": duration,
+        "frames": frames,
+        "frames_per_second": round(frames / elapsed, 1) if elapsed else None,
+        "realtime_factor": round(duration / elapsed, 2) if elapsed else None,
+        "stages": {name: round(seconds, 3) for name, seconds in stages.items()},
+        "peak_rss_mb": round(self_rss / 1024, 1),
+        "peak_child_rss_mb": round(child_rss / 1024, 1),
+        "output_bytes": os.path.getsize(case["output"]),
+    }
+
+
+def run_case_isolated(case):
+    """Run a case in a fresh interpreter so peak memory isn't shared between cases."""
+    result = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "--case", json.dumps(case)],
+        stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+    )
+    if result.returncode != 0:
+        return {"case": case, "error": result.stderr.decode('utf-8', 'replace').strip()[-2000:]}
+    return json.loads(result.stdout.decode('utf-8').strip().splitlines()[-1])
+
+
+def parse_resolution(value):
+    """Parse 'WIDTHxHEIGHT' into a (width, height) tuple."""
+    width, height = value.lower().split("x")
+    return int(width), int(height)
+
+
+def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(description="Benchmark the deals video renderer.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 50, 200, 1000],
+                        help="Product counts to benchmark")
+    parser.add_argument("--resolutions", nargs="+", default=["1280x720"],
+                        help="Resolutions as WIDTHxHEIGHT")
+    parser.add_argument("--modes", nargs="+", default=["static", "numpy"],
+                        help="Render modes (static, numpy, streaming, composite)")
+    parser.add_argument("--profiles", nargs="+", default=["draft", "upload"],
+                        help="Encoder profiles from video_config.ENCODER_PROFILES")
+    parser.add_argument("--warm", action="store_true",
+                        help="Render each case once before measuring it with its caches filled "
+                             "(measures incremental reruns)")
+    parser.add_argument("--seed", type=int, default=0, help="Catalog random seed")
+    parser.add_argument("--output", help="Write the JSON report to this file")
+    parser.add_argument("--case", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.case:
+        print(json.dumps(run_case(json.loads(args.case))))
+        return
+
+    results = []
+    with tempfile.TemporaryDirectory(prefix="deals_bench_") as work_dir:
+        for size in args.sizes:
+            catalog = os.path.join(work_dir, f"products_{size}.json")
+            with open(catalog, 'w', encoding='utf-8') as f:
+                json.dump(make_catalog(size, args.seed), f)
+
+            for resolution in args.resolutions:
+                width, height = parse_resolution(resolution)
+                for mode in args.modes:
+                    for profile in args.profiles:
+                        case = {
+                            "catalog": catalog,
+                            "output": os.path.join(work_dir, "bench.mp4"),
+                            "width": width,
+                            "height": height,
+                            "mode": mode,
+                            "profile": profile,
+                            # Every case gets its own caches, so results don't depend on case order
+                            "cache_dir": os.path.join(work_dir, f"cache_{len(results)}"),
+                            "warm": args.warm,
+                        }
+                        print(f"Benchmarking {size} products, {resolution}, {mode}, {profile}...",
+                              file=sys.stderr)
+                        if args.warm:
+                            run_case_isolated(case)
+                        results.append(run_case_isolated(case))
+
+    report = {
+        "timestamp": datetime.now().isoformat(),
+        "cpu_count": os.cpu_count(),
+        "results": results,
+    }
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(output)
+        print(f"Wrote {len(results)} results to {args.output}", file=sys.stderr)
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""
+Cache Eviction
+Size-bounded LRU eviction for the on-disk caches, which refresh a file's
+modification time on every hit
+"""
+
+import os
+
+
+def evict_lru(cache_dir, max_bytes, target_bytes=None):
+    """
+    Remove least recently used files once a cache directory exceeds max_bytes.
+
+    Args:
+        cache_dir: Directory to trim (walked recursively)
+        max_bytes: Size the cache may grow to
+        target_bytes: Size to trim down to once over max_bytes (defaults to max_bytes)
+
+    Returns:
+        tuple: (files removed, bytes left in the cache)
+    """
+    if target_bytes is None:
+        target_bytes = max_bytes
+    if not cache_dir or not os.path.isdir(cache_dir):
+        return 0, 0
+
+    entries = []
+    for root, _, files in os.walk(cache_dir):
+        for name in files:
+            path = os.path.join(root, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+    total = sum(size for _, size, _ in entries)
+    if total <= max_bytes:
+        return 0, total
+    removed = 0
+    for _, size, path in sorted(entries):
+        if total <= target_bytes:
+            break
+        try:
+            os.remove(path)
+        except OSError:
+            continue
+        total -= size
+        removed += 1
+    return removed, total
@@ -18,7 +18,70 @@ MARKETPLACE = "www.amazon.com"
 # Search Settings
 SEARCH_KEYWORDS = "Popular Romance books today"  # Keywords to search for deals
 SEARCH_INDEX = "All"  # Search across all categories
-MAX_ITEMS = 10  # Maximum number of items to fetch
+MAX_ITEMS = 10  # Maximum number of items to fetch (per page, PA API limit is 10)
+SEARCH_PAGES = 3  # Result pages to fetch per keyword (1-10)
+TARGET_DEALS = 30  # Stop paging once this many qualifying deals were found
+MIN_SAVINGS_PERCENT = 20  # Savings percentage a deal needs to qualify
+FETCH_WORKERS = 4  # Concurrent searches when fetching several categories
+
+# Product store (SQLite catalog with price history; products.json is exported from it)
+PRODUCT_DB = "products.db"
+
+# Product images (downloaded after each fetch, content-addressed, for the video and blog)
+PREFETCH_IMAGES = True
+IMAGE_CACHE_DIR = "images"
+IMAGE_WORKERS = 8  # Concurrent downloads (also the HTTP connection pool size)
+IMAGE_TIMEOUT = 15  # Seconds per request
+IMAGE_REVALIDATE_AFTER = 24 * 60 * 60  # Seconds before a cached image is re-checked with the server
+IMAGE_CACHE_MAX_BYTES = 200 * 1024 * 1024  # 200 MB
+BLOG_LOCAL_IMAGES = True  # Blog links the cached images instead of Amazon's
+
+# Near-duplicate removal (same book in several formats or editions)
+DEDUPE_PRODUCTS = True
+DEDUPE_THRESHOLD = 0.6  # Title shingle similarity (0-1) that counts as a duplicate
+DEDUPE_NUM_PERM = 64  # MinHash signature length
+DEDUPE_BANDS = 16  # LSH bands (DEDUPE_NUM_PERM must be a multiple)
+
+# Deal ranking (picks the best TOP_K candidates for the video and blog)
+RANK_DEALS = True
+TOP_K = 10
+RANK_WEIGHTS = {
+    "savings_percent": 1.0,  # Savings percentage (0-100% -> 0-1)
+    "savings_amount": 0.5,   # Absolute savings, log-scaled up to RANK_SAVINGS_CAP
+    "prime": 0.2,            # Prime eligible
+    "freshness": 0.3,        # Current price is at its lowest of the last RANK_HISTORY_DAYS
+    "recency": 0.3,          # Product appeared recently (new deals beat repeats)
+}
+RANK_SAVINGS_CAP = 50.0  # Savings (in currency units) that earn the full amount score
+RANK_HISTORY_DAYS = 30
+RANK_RECENCY_HALF_LIFE_DAYS = 7.0
+
+# Rate Limits (see your account's PA API quota)
+API_TPS = 1.0  # Requests per second
+API_BURST = 1  # Requests allowed back to back before pacing kicks in
+API_TPD = 8640  # Requests per day
+# Requests used today, kept across runs so API_TPD holds for the whole day.
+# Runs that start from a fresh checkout (e.g. CI runners) start at 0, and
+# concurrent processes may each miss the other's latest requests.
+API_USAGE_FILE = ".cache/paapi_usage.json"
+API_MAX_RETRIES = 5  # Retries after a TooManyRequests error
+API_BACKOFF_BASE = 1.0  # Seconds; doubles on each retry
+API_BACKOFF_MAX = 30.0  # Seconds
+
+# Response cache (repeated requests within the TTL skip the API)
+API_CACHE = True
+API_CACHE_DIR = ".cache/paapi"
+API_CACHE_TTL = {  # Seconds per operation
+    "search_items": 6 * 60 * 60,
+    "get_items": 10 * 60,  # Well under the hourly re-price, so a refresh gets live prices
+}
+API_CACHE_MAX_BYTES = 100 * 1024 * 1024  # 100 MB
+
+# Replay cached responses only, never calling the API
+API_OFFLINE = os.getenv("PAAPI_OFFLINE") == "1"
+
+# Use the local fake PA API (fake_paapi.py) instead of Amazon
+USE_FAKE_API = os.getenv("PAAPI_FAKE") == "1"
 
 # Resources to request from API
 RESOURCES = [
@@ -31,6 +94,9 @@ RESOURCES = [
     "Images.Primary.Large",
 ]
 
+# Resources requested when re-pricing known ASINs
+PRICE_RESOURCES = [r for r in RESOURCES if r.startswith("Offers.")]
+
 # Book Categories for Random Search
 BOOK_CATEGORIES = [
     "Arts & Photography",
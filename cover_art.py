@@ -0,0 +1,112 @@
+"""
+Cover Art
+Turns cached product images into slide layers: each cover is decoded once
+(for all renditions), resized once per box with Lanczos resampling and kept
+as an RGBA array (in memory and on disk), so renderers only blend it
+"""
+
+import hashlib
+import json
+import os
+from collections import OrderedDict
+
+import numpy as np
+import PIL
+from PIL import Image
+
+import video_config
+import image_cache
+import raster_cache
+
+# Bump when the resizing code changes
+COVER_VERSION = 1
+
+_cache = raster_cache.RasterCache("cover", "COVER_CACHE_DIR", "COVER_CACHE_MAX_BYTES")
+_image_index = None
+
+# Decoded source images, so a cover resized into several boxes (one per
+# rendition) is decoded once. Renditions of a slide are rendered back to
+# back, so a few entries suffice.
+SOURCE_CACHE_SIZE = 4
+_sources = OrderedDict()
+
+
+def cover_file(product):
+    """
+    Return the cached image file for a product's cover, or None.
+
+    The image index is read once per process.
+    """
+    global _image_index
+    if not video_config.SHOW_COVER or not product or not product.get("image_url"):
+        return None
+    if _image_index is None:
+        _image_index = image_cache.load_index()
+    return image_cache.local_image_path(product["image_url"], _image_index)
+
+
+def cover_key(path, box):
+    """Return the cache key for a cover resized into a box."""
+    # Image files are content-addressed, so the file name identifies the pixels
+    payload = [COVER_VERSION, PIL.__version__, os.path.basename(path), list(box)]
+    return hashlib.sha256(json.dumps(payload).encode('utf-8')).hexdigest()
+
+
+def load_source(path):
+    """Return a cover's decoded RGBA image, decoding it only on a miss."""
+    image = _sources.get(path)
+    if image is not None:
+        _sources.move_to_end(path)
+        return image
+    with Image.open(path) as source:
+        image = source.convert("RGBA")
+    _sources[path] = image
+    if len(_sources) > SOURCE_CACHE_SIZE:
+        _sources.popitem(last=False)
+    return image
+
+
+def resize_cover(path, box):
+    """
+    Fit an image into a box, keeping its aspect ratio.
+
+    The result is exactly box-sized: the image is centered and the rest is
+    transparent, so the layer's position doesn't depend on the image.
+
+    Returns:
+        numpy.ndarray: RGBA uint8 array of shape (box height, box width, 4)
+    """
+    box_width, box_height = box
+    image = load_source(path)
+    scale = min(box_width / image.width, box_height / image.height)
+    size = (max(1, round(image.width * scale)), max(1, round(image.height * scale)))
+    image = image.resize(size, Image.LANCZOS)
+    canvas = Image.new("RGBA", (box_width, box_height), (0, 0, 0, 0))
+    canvas.paste(image, ((box_width - size[0]) // 2, (box_height - size[1]) // 2))
+    return np.asarray(canvas, dtype=np.uint8)
+
+
+def render_cover(source, box, cache_dir=None):
+    """
+    Return the RGBA raster of a cover image, resizing it only on a miss.
+
+    Args:
+        source: Path of the cached image file
+        box: (width, height) to fit the image into
+        cache_dir: Directory for persisted rasters (defaults to video_config.COVER_CACHE_DIR)
+
+    Returns:
+        numpy.ndarray: Read-only RGBA uint8 array of shape (height, width, 4)
+    """
+    return _cache.get(cover_key(source, box), lambda: resize_cover(source, box), cache_dir)
+
+
+def evict(max_bytes=None, cache_dir=None):
+    """
+    Remove least recently used rasters until the disk cache fits in max_bytes
+    (defaults to video_config.COVER_CACHE_MAX_BYTES).
+
+    Returns:
+        int: Number of rasters removed
+    """
+    return _cache.evict(max_bytes, cache_dir)
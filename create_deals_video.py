@@ -5,10 +5,37 @@ Each product is displayed for 4 seconds with pricing information
 """
 
 import json
+import os
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor
 import moviepy
-from moviepy import ImageClip, TextClip, CompositeVideoClip, concatenate_videoclips, AudioFileClip, afx
+from moviepy import ImageClip, VideoClip, CompositeVideoClip, concatenate_videoclips
 import numpy as np
 import video_config
+import backgrounds
+import video_segments
+import segment_cache
+import text_cache
+import cover_art
+import slide_layout
+import fast_compositor
+import audio_track
+import renditions
+import transitions
+
+
+@contextmanager
+def timed(timings, stage):
+    """Add the time spent in the block to timings[stage] (if timings is a dict)."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        if timings is not None:
+            timings[stage] = timings.get(stage, 0.0) + time.perf_counter() - start
 
 
 def load_deals(filename="products.json"):
@@ -19,20 +46,39 @@ def load_deals(filename="products.json"):
 
 
 def create_gradient_background(width, height):
-    """Create a gradient background image."""
-    # Create gradient from top to bottom
-    gradient = np.zeros((height, width, 3), dtype=np.uint8)
+    """Create the slide background image in the configured style."""
+    return backgrounds.slide_background(width, height)
+
+
+def compose_layers(layers, width, height, duration):
+    """
+    Composite text and image layers over the background.
     
-    start_color = np.array(video_config.GRADIENT_START)
-    end_color = np.array(video_config.GRADIENT_END)
+    Args:
+        layers: Layer descriptions from slide_layout
+        width: Video width
+        height: Video height
+        duration: Slide duration in seconds
+        
+    Returns:
+        VideoClip: Composited clip (just the background if no layer could be created)
+    """
+    background = create_gradient_background(width, height)
+    bg_clip = ImageClip(background, duration=duration)
     
-    for y in range(height):
-        # Linear interpolation between start and end colors
-        ratio = y / height
-        color = start_color * (1 - ratio) + end_color * ratio
-        gradient[y, :] = color.astype(np.uint8)
+    clips = [bg_clip]
+    for layer in layers:
+        try:
+            raster = slide_layout.render_layer(layer)
+            clip = text_cache.raster_clip(raster, duration).with_position(layer["position"])
+            clips.append(clip)
+        except Exception as e:
+            print(f"    Warning: Could not create {layer['name']} clip: {e}")
     
-    return gradient
+    # Composite all clips - only use background if no text clips were created
+    if len(clips) == 1:
+        return bg_clip
+    return CompositeVideoClip(clips)
 
 
 def create_product_slide(product, width, height, duration):
@@ -48,281 +94,427 @@ def create_product_slide(product, width, height, duration):
     Returns:
         VideoClip: Video clip for this product
     """
-    # Create background
-    background = create_gradient_background(width, height)
-    bg_clip = ImageClip(background, duration=duration)
-    
-    # Create text clips
-    clips = [bg_clip]
+    return compose_layers(slide_layout.product_layers(product, width, height), width, height, duration)
+
+
+def create_intro_slide(width, height, duration=None):
+    """Create an intro slide (video_config.INTRO_DURATION long by default)."""
+    if duration is None:
+        duration = video_config.INTRO_DURATION
+    return compose_layers(slide_layout.intro_layers(width, height), width, height, duration)
+
+
+def create_outro_slide(width, height, duration=None):
+    """Create an outro slide (video_config.OUTRO_DURATION long by default)."""
+    if duration is None:
+        duration = video_config.OUTRO_DURATION
+    return compose_layers(slide_layout.outro_layers(width, height), width, height, duration)
+
+
+def rasterize_slide(clip):
+    """
+    Render a static slide clip to a single RGB frame.
     
-    # Title
-    title_text = product['title']
-    # Truncate if too long
-    if len(title_text) > 60:
-        title_text = title_text[:57] + "..."
-    # Add spaces to help with bounding box
-    title_text = title_text + "   "
+    Every slide is the same picture for its whole duration, so the
+    first frame is all that needs compositing.
+    """
+    frame = clip.get_frame(0)
+    clip.close()
+    return frame
+
+
+def build_slide(kind, product=None):
+    """
+    Build the clip for one slide of the video.
     
-    try:
-        title_clip = TextClip(
-            text=title_text,
-            font_size=video_config.TITLE_FONT_SIZE,
-            color='white',
-            size=(width - 100, 300),
-            method='caption',
-            text_align='center'
-        ).with_position(('center', int(height * video_config.TITLE_Y_POS))).with_duration(duration)
-        clips.append(title_clip)
-    except Exception as e:
-        print(f"    Warning: Could not create title clip: {e}")
-    
-    # Current Price (Large and Green)
-    # Current Price (Removed)
-    # try:
-    #     current_price_clip = TextClip(
-    #         text=product['current_price'] + " ",  # Add space to prevent clipping
-    #         font_size=video_config.CURRENT_PRICE_FONT_SIZE,
-    #         color='#22C55E',  # Green
-    #         text_align='center'
-    #     ).with_position(('center', int(height * video_config.CURRENT_PRICE_Y_POS))).with_duration(duration)
-    #     clips.append(current_price_clip)
-    # except Exception as e:
-    #     print(f"    Warning: Could not create price clip: {e}")
-    
-    # Original Price (Strikethrough effect with smaller text)
-    # Original Price (Removed)
-    # if product.get('original_price'):
-    #     try:
-    #         original_text = f"Was: {product['original_price']}"
-    #         original_price_clip = TextClip(
-    #             text=original_text,
-    #             font_size=video_config.ORIGINAL_PRICE_FONT_SIZE,
-    #             color='#94A3B8',  # Gray
-    #             text_align='center'
-    #         ).with_position(('center', int(height * video_config.ORIGINAL_PRICE_Y_POS))).with_duration(duration)
-    #         clips.append(original_price_clip)
-    #     except Exception as e:
-    #         print(f"    Warning: Could not create original price clip: {e}")
-    
-    # Savings Information
-    if product.get('savings') and product.get('savings_percentage'):
-        try:
-            savings_text = f"Save {product['savings']} ({product['savings_percentage']})"
-            savings_clip = TextClip(
-                text=savings_text,
-                font_size=video_config.SAVINGS_FONT_SIZE,
-                color='#FBBF24',  # Amber/Gold
-                size=(width - 100, 100),
-                method='caption',
-                text_align='center'
-            ).with_position(('center', int(height * video_config.SAVINGS_Y_POS))).with_duration(duration)
-            clips.append(savings_clip)
-        except Exception as e:
-            print(f"    Warning: Could not create savings clip: {e}")
+    Args:
+        kind: "intro", "product" or "outro"
+        product: Product dictionary (only for "product" slides)
+        
+    Returns:
+        VideoClip: Video clip for this slide
+    """
+    width, height = video_config.VIDEO_WIDTH, video_config.VIDEO_HEIGHT
+    if kind == "intro":
+        return create_intro_slide(width, height)
+    if kind == "outro":
+        return create_outro_slide(width, height)
+    return create_product_slide(product, width, height, slide_layout.slide_duration(kind))
+
+
+def create_streaming_video(deals, total_duration):
+    """
+    Create a clip that builds each slide lazily when its time range is reached.
     
-    # Savings Percentage Badge (Top)
-    if product.get('savings_percentage'):
-        try:
-            badge_text = f"{product['savings_percentage']} OFF"
-            badge_clip = TextClip(
-                text=badge_text,
-                font_size=video_config.BADGE_FONT_SIZE,
-                color='white',
-                bg_color='#DC2626',  # Red background
-                size=(400, 120),
-                method='caption',
-                text_align='center'
-            ).with_position(('center', int(height * video_config.BADGE_Y_POS))).with_duration(duration)
-            clips.append(badge_clip)
-        except Exception as e:
-            print(f"    Warning: Could not create badge clip: {e}")
+    Only the slide currently on screen is held in memory (as one rasterized
+    frame), so peak memory does not grow with the number of products.
     
-    # Prime Badge if eligible
-    try:
-        if product.get('is_prime_eligible'):
-            prime_clip = TextClip(
-                text="Prime Eligible",
-                font_size=35,
-                color='white',
-                bg_color='#0F9D58',  # Green
-                size=(250, 60),
-                method='caption'
-            ).with_position((width - 300, height - 100)).with_duration(duration)
-            clips.append(prime_clip)
-    except Exception as e:
-        print(f"    Warning: Could not create prime clip: {e}")
-
-    # Link in Description Text
-    try:
-        link_text_clip = TextClip(
-            text="Product Link in Description",
-            font_size=video_config.LINK_TEXT_FONT_SIZE,
-            color='white',
-            size=(width - 100, 100),
-            method='caption',
-            text_align='center'
-        ).with_position(('center', int(height * video_config.LINK_TEXT_Y_POS))).with_duration(duration)
-        clips.append(link_text_clip)
-    except Exception as e:
-        print(f"    Warning: Could not create link text clip: {e}")
+    Args:
+        deals: List of product dictionaries
+        total_duration: Total video duration in seconds
+        
+    Returns:
+        VideoClip: Clip producing the whole video's frames
+    """
+    slides = slide_layout.slide_sequence(deals)
+    state = {"slides": iter(slides), "index": 0, "start": 0.0, "end": 0.0, "frame": None}
     
-    # Composite all clips - only use background if no text clips were created
-    if len(clips) == 1:
-        final_clip = bg_clip
-    else:
-        final_clip = CompositeVideoClip(clips)
+    def restart():
+        state.update(slides=iter(slides), index=0, start=0.0, end=0.0, frame=None)
     
-    # Add fade in/out
-    # try:
-    #     final_clip = final_clip.fadein(0.3).fadeout(0.3)
-    # except:
-    #     pass  # Fade effects are optional
+    def frame_function(t):
+        # Frames are normally requested in order; seeking back starts over
+        if t < state["start"]:
+            restart()
+        while t >= state["end"] or state["frame"] is None:
+            try:
+                kind, product, _ = next(state["slides"])
+            except StopIteration:
+                break
+            state["index"] += 1
+            if kind == "product":
+                print(f"  [{state['index'] - 1}/{len(deals)}] Creating slide for: {product['title'][:40]}...")
+            clip = build_slide(kind, product)
+            state["start"], state["end"] = state["end"], state["end"] + clip.duration
+            # Drop the previous slide before rasterizing the next one
+            state["frame"] = None
+            state["frame"] = rasterize_slide(clip)
+        return state["frame"]
     
-    return final_clip
+    return VideoClip(frame_function, duration=total_duration)
 
 
-def create_intro_slide(width, height, duration=3):
-    """Create an intro slide."""
-    background = create_gradient_background(width, height)
-    bg_clip = ImageClip(background, duration=duration)
+def frame_file(segment_file):
+    """Return the path a segment's slide frame is saved at (for transitions)."""
+    return os.path.splitext(segment_file)[0] + ".npy"
+
+
+def render_segment(job):
+    """
+    Render and encode one slide as a still segment.
     
-    try:
-        title_clip = TextClip(
-            text="Amazon Deals",
-            font_size=120,
-            color='white',
-            size=(width - 100, 300),
-            method='caption'
-        ).with_position(('center', int(height * 0.30))).with_duration(duration)
+    Runs inside a worker process, so it only takes picklable arguments.
+    When transitions are on, the slide is shortened by the transition
+    window and its frame is saved next to the segment (see frame_file)
+    for rendering the transitions.
+    
+    Args:
+        job: Tuple of (kind, product, output_file, settings), where settings
+            are the rendition's video_config overrides
         
-        subtitle_clip = TextClip(
-            text="Today's Best Offers",
-            font_size=60,
-            color='#FBBF24',
-            size=(width - 100, 150),
-            method='caption'
-        ).with_position(('center', int(height * 0.75))).with_duration(duration)
+    Returns:
+        str: Path of the encoded segment
+    """
+    kind, product, output_file, settings = job
+    with renditions.applied(settings):
+        clip = build_slide(kind, product)
+        duration = transitions.body_duration(kind, clip.duration)
+        frame = rasterize_slide(clip)
+        if transitions.frame_count():
+            np.save(frame_file(output_file), frame)
+        return video_segments.write_still_segment(frame, duration, output_file)
+
+
+def load_slide_frame(kind, product, frame_path):
+    """Load a slide's saved frame, or composite the slide again if there is none."""
+    if frame_path:
+        try:
+            return np.load(frame_path)
+        except (OSError, ValueError) as e:
+            print(f"    Warning: Ignoring unreadable slide frame {frame_path}: {e}")
+    return rasterize_slide(build_slide(kind, product))
+
+
+def render_transition(job):
+    """
+    Render and encode the transition between two slides.
+    
+    Runs inside a worker process, so it only takes picklable arguments.
+    
+    Args:
+        job: Tuple of (slide_a, slide_b, output_file, settings), where each
+            slide is (kind, product, frame_path) and frame_path may be None
         
-        final_clip = CompositeVideoClip([bg_clip, title_clip, subtitle_clip])
-        # final_clip = final_clip.fadein(0.5).fadeout(0.5)
-    except Exception as e:
-        print(f"Warning: Could not create intro with text: {e}")
-        final_clip = bg_clip
+    Returns:
+        str: Path of the encoded segment
+    """
+    slide_a, slide_b, output_file, settings = job
+    with renditions.applied(settings):
+        frame_a = load_slide_frame(*slide_a)
+        frame_b = load_slide_frame(*slide_b)
+        return transitions.write_transition_segment(frame_a, frame_b, output_file)
+
+
+def render_static_video(deals, output_file, total_duration, workers=None, timings=None):
+    """
+    Render the video as still-image segments joined by stream copy.
     
-    return final_clip
+    Args:
+        deals: List of product dictionaries
+        output_file: Output video filename
+        total_duration: Total video duration in seconds
+        workers: Number of worker processes (defaults to video_config.RENDER_WORKERS)
+        timings: Optional dict that receives seconds spent per stage
+    """
+    render_static_renditions(deals, [({}, output_file)], total_duration, workers=workers, timings=timings)
 
 
-def create_outro_slide(width, height, duration=3):
-    """Create an outro slide."""
-    background = create_gradient_background(width, height)
-    bg_clip = ImageClip(background, duration=duration)
+def render_static_renditions(deals, outputs, total_duration, workers=None, timings=None):
+    """
+    Render one or more renditions as still-image segments joined by stream copy.
     
-    try:
-        title_clip = TextClip(
-            text="Thanks for Watching!",
-            font_size=100,
-            color='white',
-            size=(width - 100, 300),
-            method='caption'
-        ).with_position(('center', int(height * 0.30))).with_duration(duration)
+    Each slide of each rendition is composited once and encoded as a
+    looped still segment; with transitions on, only the short transition
+    windows between slides are rendered frame by frame, from the two
+    slides' frames. The segments of all renditions share one pool of
+    worker processes, then each rendition's segments are concatenated
+    without re-encoding. Segments found in the segment cache are reused
+    instead of being rendered again, and the audio track is shared.
+    
+    Args:
+        deals: List of product dictionaries
+        outputs: List of (settings, output_file), settings being the
+            rendition's video_config overrides
+        total_duration: Total video duration in seconds
+        workers: Number of worker processes (defaults to video_config.RENDER_WORKERS)
+        timings: Optional dict that receives seconds spent per stage
+    """
+    if workers is None:
+        workers = video_config.RENDER_WORKERS or os.cpu_count() or 1
+    
+    use_cache = video_config.SEGMENT_CACHE
+    slides = [(kind, product) for kind, product, _ in slide_layout.slide_sequence(deals)]
+    
+    with tempfile.TemporaryDirectory(prefix="deals_segments_") as segment_dir:
+        segments = [[None] * len(slides) for _ in outputs]
+        keys = [[None] * len(slides) for _ in outputs]
+        # Transition r, i leads from slide i to slide i + 1 of rendition r
+        links = []
+        for settings, _ in outputs:
+            with renditions.applied(settings):
+                links.append([None] * (len(slides) - 1) if transitions.frame_count() else [])
+        link_keys = [[None] * len(rendition_links) for rendition_links in links]
+        
+        # Reuse segments whose content hasn't changed since the last run
+        if use_cache:
+            with timed(timings, "cache_lookup"):
+                for r, (settings, _) in enumerate(outputs):
+                    with renditions.applied(settings):
+                        for i, (kind, product) in enumerate(slides):
+                            keys[r][i] = segment_cache.segment_key(kind, product)
+                            segments[r][i] = segment_cache.lookup(keys[r][i])
+                    for i in range(len(links[r])):
+                        link_keys[r][i] = segment_cache.transition_key(keys[r][i], keys[r][i + 1])
+                        links[r][i] = segment_cache.lookup(link_keys[r][i])
+        
+        # All renditions of a slide are rendered back to back, in one
+        # worker (see chunksize below), so its cover is decoded once
+        pending = [(r, i) for i in range(len(slides)) for r in range(len(outputs)) if segments[r][i] is None]
+        jobs = [
+            (slides[i][0], slides[i][1], os.path.join(segment_dir, f"{r}_{i:05d}_{slides[i][0]}.mp4"), outputs[r][0])
+            for r, i in pending
+        ]
+        frames = {(r, i): frame_file(job[2]) for (r, i), job in zip(pending, jobs)}
+        
+        def slide_frame(r, i):
+            # Frames of slides rendered in this run, else the cached frame
+            if (r, i) in frames:
+                return frames[(r, i)]
+            return segment_cache.lookup(keys[r][i], extension=".npy") if use_cache else None
+        
+        pending_links = [(r, i) for r in range(len(outputs)) for i in range(len(links[r])) if links[r][i] is None]
+        link_jobs = [
+            (slides[i] + (slide_frame(r, i),), slides[i + 1] + (slide_frame(r, i + 1),),
+             os.path.join(segment_dir, f"{r}_{i:05d}_transition.mp4"), outputs[r][0])
+            for r, i in pending_links
+        ]
+        cached = sum(len(s) for s in segments) + sum(len(l) for l in links) - len(jobs) - len(link_jobs)
+        print(f"  Reusing {cached} cached segments")
         
-        subtitle_clip = TextClip(
-            text="Check description for links",
-            font_size=50,
-            color='#FBBF24',
-            size=(width - 100, 150),
-            method='caption'
-        ).with_position(('center', int(height * 0.75))).with_duration(duration)
+        if jobs or link_jobs:
+            print(f"  Rendering {len(jobs)} slides and {len(link_jobs)} transitions with {workers} worker(s)...")
+        with timed(timings, "slides"):
+            executor = ProcessPoolExecutor(max_workers=workers) if workers > 1 and len(jobs) + len(link_jobs) > 1 else None
+            run = executor.map if executor else map
+            try:
+                rendered = executor.map(render_segment, jobs, chunksize=len(outputs)) if executor else map(render_segment, jobs)
+                for n, ((r, i), segment) in enumerate(zip(pending, rendered), 1):
+                    print(f"  [{n}/{len(jobs)}] Encoded {os.path.basename(segment)}")
+                    if use_cache:
+                        if links[r]:
+                            segment_cache.store(keys[r][i], frame_file(segment), extension=".npy")
+                        segment = segment_cache.store(keys[r][i], segment)
+                    segments[r][i] = segment
+                
+                # Transitions need the frames of the slides on both sides
+                for n, ((r, i), segment) in enumerate(zip(pending_links, run(render_transition, link_jobs)), 1):
+                    print(f"  [{n}/{len(link_jobs)}] Encoded {os.path.basename(segment)}")
+                    if use_cache:
+                        segment = segment_cache.store(link_keys[r][i], segment)
+                    links[r][i] = segment
+            finally:
+                if executor:
+                    executor.shutdown()
         
-        final_clip = CompositeVideoClip([bg_clip, title_clip, subtitle_clip])
-        # final_clip = final_clip.fadein(0.5).fadeout(0.5)
-    except Exception as e:
-        print(f"Warning: Could not create outro with text: {e}")
-        final_clip = bg_clip
+        with timed(timings, "audio"):
+            audio_file = audio_track.background_track(total_duration)
+        
+        for (_, output_file), rendition_segments, rendition_links in zip(outputs, segments, links):
+            ordered = []
+            for i, segment in enumerate(rendition_segments):
+                ordered.append(segment)
+                if i < len(rendition_links):
+                    ordered.append(rendition_links[i])
+            print(f"\nJoining {len(ordered)} segments into {output_file}...")
+            with timed(timings, "concat"):
+                video_segments.concat_segments(ordered, output_file, audio_file=audio_file)
     
-    return final_clip
+    if use_cache:
+        with timed(timings, "cache_evict"):
+            segment_cache.evict()
 
 
-def create_deals_video(input_file="products.json", output_file=None):
+def create_deals_video(input_file="products.json", output_file=None, render_mode=None, workers=None,
+                       rendition_names=None):
     """
     Create a video from deals data.
     
     Args:
         input_file: Path to products.json
-        output_file: Output video filename
+        output_file: Output video filename (other renditions add their name to it)
+        render_mode: "static", "numpy", "streaming" or "composite" (defaults to video_config.RENDER_MODE)
+        workers: Worker processes for static rendering (defaults to video_config.RENDER_WORKERS)
+        rendition_names: Renditions to render (defaults to video_config.OUTPUT_RENDITIONS)
+        
+    Returns:
+        dict: Seconds spent in each render stage
     """
     if output_file is None:
         output_file = video_config.OUTPUT_FILENAME
+    if render_mode is None:
+        render_mode = video_config.RENDER_MODE
+    names = renditions.rendition_names(rendition_names)
+    outputs = [(renditions.rendition_settings(name), renditions.output_filename(name, output_file))
+               for name in names]
     
     print("=" * 60)
     print("Amazon Deals Video Generator")
     print("=" * 60)
     
+    timings = {}
+    
     # Load deals
     print(f"\nLoading deals from {input_file}...")
-    deals = load_deals(input_file)
+    with timed(timings, "load"):
+        deals = load_deals(input_file)
     print(f"Found {len(deals)} deals")
     
+    # Calculate total duration
+    total_duration = slide_layout.video_duration(deals)
+    
     # Create video clips
     print("\nCreating video slides...")
-    clips = []
-    
-    # Intro
-    print("  Creating intro slide...")
-    intro = create_intro_slide(video_config.VIDEO_WIDTH, video_config.VIDEO_HEIGHT)
-    clips.append(intro)
-    
-    # Product slides
-    for i, product in enumerate(deals, 1):
-        print(f"  [{i}/{len(deals)}] Creating slide for: {product['title'][:40]}...")
-        slide = create_product_slide(
-            product,
-            video_config.VIDEO_WIDTH,
-            video_config.VIDEO_HEIGHT,
-            video_config.SLIDE_DURATION
-        )
-        clips.append(slide)
-    
-    # Outro
-    print("  Creating outro slide...")
-    outro = create_outro_slide(video_config.VIDEO_WIDTH, video_config.VIDEO_HEIGHT)
-    clips.append(outro)
-    
-    # Concatenate all clips
-    print("\nCombining all slides...")
-    # Use method="chain" which is more memory efficient than "compose"
-    final_video = concatenate_videoclips(clips, method="chain")
+    if render_mode == "static":
+        # All renditions share one worker pool
+        render_static_renditions(deals, outputs, total_duration, workers=workers, timings=timings)
+    else:
+        for settings, rendition_file in outputs:
+            with renditions.applied(settings):
+                if render_mode == "numpy":
+                    fast_compositor.render_numpy_video(deals, rendition_file, total_duration, timings=timings)
+                else:
+                    render_moviepy_video(deals, rendition_file, total_duration, render_mode, timings)
     
-    # Calculate total duration
-    total_duration = len(deals) * video_config.SLIDE_DURATION + 6  # +6 for intro/outro
+    with timed(timings, "cache_evict"):
+        text_cache.evict()
+        cover_art.evict()
+        audio_track.evict()
+
     print(f"Total video duration: {total_duration} seconds ({total_duration/60:.1f} minutes)")
-    
-    # Add background music
-    if video_config.AUDIO and video_config.AUDIO_FILENAME:
-        print(f"\nAdding background music: {video_config.AUDIO_FILENAME}")
-        try:
-            bg_music = AudioFileClip(video_config.AUDIO_FILENAME)
-            # Loop music to match video duration
-            bg_music = bg_music.with_effects([afx.AudioLoop(duration=total_duration)])
-            final_video = final_video.with_audio(bg_music)
-        except Exception as e:
-            print(f"Warning: Could not add background music: {e}")
+    for settings, rendition_file in outputs:
+        with renditions.applied(settings):
+            print_summary(deals, rendition_file, total_duration)
+    return timings
 
+
+def render_moviepy_video(deals, output_file, total_duration, render_mode, timings=None):
+    """
+    Render the video with MoviePy ("streaming" or "composite" mode).
+    
+    Args:
+        deals: List of product dictionaries
+        output_file: Output video filename
+        total_duration: Total video duration in seconds
+        render_mode: "streaming" builds slides lazily, "composite" builds them all up front
+        timings: Optional dict that receives seconds spent per stage
+    """
+    with timed(timings, "slides"):
+        if render_mode == "streaming":
+            # Slides are built one at a time while the encoder reaches them
+            final_video = create_streaming_video(deals, total_duration)
+        else:
+            clips = []
+            
+            # Intro
+            print("  Creating intro slide...")
+            intro = create_intro_slide(video_config.VIDEO_WIDTH, video_config.VIDEO_HEIGHT)
+            clips.append(intro)
+            
+            # Product slides
+            for i, product in enumerate(deals, 1):
+                print(f"  [{i}/{len(deals)}] Creating slide for: {product['title'][:40]}...")
+                slide = create_product_slide(
+                    product,
+                    video_config.VIDEO_WIDTH,
+                    video_config.VIDEO_HEIGHT,
+                    video_config.SLIDE_DURATION
+                )
+                clips.append(slide)
+            
+            # Outro
+            print("  Creating outro slide...")
+            outro = create_outro_slide(video_config.VIDEO_WIDTH, video_config.VIDEO_HEIGHT)
+            clips.append(outro)
+            
+            # Concatenate all clips
+            print("\nCombining all slides...")
+            # Use method="chain" which is more memory efficient than "compose"
+            final_video = concatenate_videoclips(clips, method="chain")
+    
     # Write video file
     print(f"\nRendering video to {output_file}...")
     print("This may take a few minutes...")
     
-    final_video.write_videofile(
-        output_file,
-        fps=video_config.FPS,
-        codec=video_config.CODEC,
-        bitrate=video_config.BITRATE,
-        audio=video_config.AUDIO,
-        threads=1,
-        preset='ultrafast',
-        logger='bar'
-    )
+    # Background music is pre-encoded and muxed in by stream copy afterwards
+    with timed(timings, "audio"):
+        audio_file = audio_track.background_track(total_duration)
+    video_file = output_file + ".video.mp4" if audio_file else output_file
+    
+    encoder = video_segments.encoder_settings()
+    with timed(timings, "encode"):
+        final_video.write_videofile(
+            video_file,
+            fps=video_config.FPS,
+            codec=video_config.CODEC,
+            bitrate=encoder.get("bitrate"),
+            audio=False,
+            threads=encoder.get("threads") or os.cpu_count(),
+            preset=encoder["preset"],
+            ffmpeg_params=video_segments.x264_params(),
+            logger='bar'
+        )
+    
+    if audio_file:
+        try:
+            with timed(timings, "mux"):
+                video_segments.mux_audio(video_file, audio_file, output_file)
+        finally:
+            os.remove(video_file)
     
+
+
+def print_summary(deals, output_file, total_duration):
+    """Print the final video specs."""
     print("\n" + "=" * 60)
     print(f"Video created successfully: {output_file}")
     print("=" * 60)
@@ -335,8 +527,17 @@ def create_deals_video(input_file="products.json", output_file=None):
 
 
 def main():
-    """Main function."""
-    create_deals_video()
+    """
+    Main function.
+    
+    Rendition names on the command line pick the renditions to render
+    ("all" renders every configured one), e.g.:
+        python create_deals_video.py landscape shorts
+    """
+    names = sys.argv[1:] or None
+    if names == ["all"]:
+        names = list(video_config.RENDITIONS)
+    create_deals_video(rendition_names=names)
 
 
 if __name__ == "__main__":
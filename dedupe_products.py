@@ -0,0 +1,192 @@
+"""
+Near-Duplicate Detection
+Clusters products whose titles are near-identical (the same book as
+paperback, hardcover or a new edition under different ASINs) with a
+MinHash/LSH index and keeps the best-priced member of each cluster.
+Each title is only compared with the titles it shares an LSH bucket with.
+"""
+
+import re
+import zlib
+
+import numpy as np
+
+import config
+from product_model import Product
+
+# Words that name a format or edition rather than the book itself
+FORMAT_WORDS = {
+    "paperback", "hardcover", "hardback", "kindle", "ebook", "audiobook", "audible",
+    "edition", "ed", "updated", "revised", "version",
+    "first", "second", "third", "fourth", "fifth", "sixth", "seventh", "eighth", "ninth", "tenth",
+}
+
+_BRACKETS = re.compile(r"[\(\[][^\)\]]*[\)\]]")
+_WORDS = re.compile(r"[a-z0-9]+")
+_ORDINAL_OR_YEAR = re.compile(r"^(\d+(st|nd|rd|th)|(19|20)\d\d)$")
+
+SHINGLE_SIZE = 4
+
+
+def normalize_title(title):
+    """Lowercase a title and drop bracketed notes, format words, ordinals and years."""
+    title = _BRACKETS.sub(" ", (title or "").lower())
+    words = [
+        word for word in _WORDS.findall(title)
+        if word not in FORMAT_WORDS and not _ORDINAL_OR_YEAR.match(word)
+    ]
+    return " ".join(words)
+
+
+def shingles(title):
+    """Return the set of crc32-hashed character shingles of a normalized title."""
+    text = normalize_title(title)
+    if len(text) <= SHINGLE_SIZE:
+        return {zlib.crc32(text.encode('utf-8'))} if text else set()
+    return {
+        zlib.crc32(text[i:i + SHINGLE_SIZE].encode('utf-8'))
+        for i in range(len(text) - SHINGLE_SIZE + 1)
+    }
+
+
+def title_numbers(title):
+    """
+    Return the numbers left in a normalized title.
+
+    Numbers that survive normalization usually tell books of a series
+    apart ("Grade 3" and "Grade 4"), so titles must agree on them.
+    """
+    return frozenset(word for word in normalize_title(title).split() if word.isdigit())
+
+
+def jaccard(a, b):
+    """Jaccard similarity of two sets."""
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+class MinHashLSH:
+    """
+    MinHash signatures split into bands; titles sharing any band are candidates.
+
+    With b bands of r rows, two titles with Jaccard similarity s collide
+    with probability 1 - (1 - s^r)^b, which is steep around (1/b)^(1/r).
+    """
+
+    def __init__(self, num_perm=None, bands=None, seed=1):
+        self.num_perm = num_perm if num_perm is not None else config.DEDUPE_NUM_PERM
+        self.bands = bands if bands is not None else config.DEDUPE_BANDS
+        if self.num_perm % self.bands:
+            raise ValueError(f"num_perm ({self.num_perm}) must be a multiple of bands ({self.bands})")
+        self.rows = self.num_perm // self.bands
+        rng = np.random.default_rng(seed)
+        # Multiply-shift hash family: h(x) = ((a * x + b) mod 2^64) >> 32
+        self.a = rng.integers(1, 2 ** 63, self.num_perm, dtype=np.uint64) | np.uint64(1)
+        self.b = rng.integers(0, 2 ** 63, self.num_perm, dtype=np.uint64)
+        self.buckets = [{} for _ in range(self.bands)]
+
+    def signature(self, shingle_set):
+        """Return the MinHash signature of a set of hashed shingles."""
+        if not shingle_set:
+            return np.full(self.num_perm, np.iinfo(np.uint64).max, dtype=np.uint64)
+        values = np.fromiter(shingle_set, dtype=np.uint64, count=len(shingle_set))
+        hashes = (values[:, None] * self.a + self.b) >> np.uint64(32)
+        return hashes.min(axis=0)
+
+    def band_keys(self, signature):
+        rows = self.rows
+        return [signature[i * rows:(i + 1) * rows].tobytes() for i in range(self.bands)]
+
+    def query(self, keys):
+        """Return the ids stored in any of the buckets for these band keys."""
+        found = set()
+        for bucket, key in zip(self.buckets, keys):
+            found.update(bucket.get(key, ()))
+        return found
+
+    def insert(self, item_id, keys):
+        for bucket, key in zip(self.buckets, keys):
+            bucket.setdefault(key, []).append(item_id)
+
+
+def _price_key(product):
+    """Sort key for picking a cluster's keeper: lowest price, then biggest savings."""
+    price = product.price_cents if product.price_cents is not None else float("inf")
+    return price, -(product.savings_pct or 0.0)
+
+
+def cluster_titles(titles, threshold=None, index=None):
+    """
+    Group near-identical titles.
+
+    Args:
+        titles: List of titles
+        threshold: Shingle Jaccard similarity that counts as a duplicate
+            (defaults to config.DEDUPE_THRESHOLD); the titles' numbers must
+            also match
+        index: MinHashLSH to use (a new one by default)
+
+    Returns:
+        list: Cluster id (the index of the cluster's first title) per title
+    """
+    if threshold is None:
+        threshold = config.DEDUPE_THRESHOLD
+    if index is None:
+        index = MinHashLSH()
+
+    parent = list(range(len(titles)))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    shingle_sets = []
+    numbers = []
+    for i, title in enumerate(titles):
+        current = shingles(title)
+        shingle_sets.append(current)
+        numbers.append(title_numbers(title))
+        if not current:
+            continue
+        keys = index.band_keys(index.signature(current))
+        for j in index.query(keys):
+            if numbers[i] == numbers[j] and jaccard(current, shingle_sets[j]) >= threshold:
+                root_i, root_j = find(i), find(j)
+                if root_i != root_j:
+                    # Keep the earliest title as the root
+                    parent[max(root_i, root_j)] = min(root_i, root_j)
+        index.insert(i, keys)
+
+    return [find(i) for i in range(len(titles))]
+
+
+def dedupe_products(products, threshold=None):
+    """
+    Drop near-duplicate products, keeping the best-priced one of each cluster.
+
+    The keeper takes the position of its cluster's first product, so the
+    input order (e.g. API relevance) is otherwise preserved.
+
+    Args:
+        products: List of products.json dictionaries
+        threshold: Title similarity that counts as a duplicate
+
+    Returns:
+        list: De-duplicated product dictionaries
+    """
+    clusters = cluster_titles([p.get("title") for p in products], threshold)
+
+    price_keys = [_price_key(Product.from_dict(p)) for p in products]
+    keepers = {}
+    for i, cluster in enumerate(clusters):
+        best = keepers.get(cluster)
+        if best is None or price_keys[i] < price_keys[best]:
+            keepers[cluster] = i
+
+    kept = [products[keepers[cluster]] for cluster in sorted(keepers)]
+    if len(kept) < len(products):
+        print(f"Removed {len(products) - len(kept)} near-duplicate products ({len(kept)} left)")
+    return kept
@@ -0,0 +1,90 @@
+"""
+Fake PA API
+Local stand-in for amazon.paapi.AmazonAPI that serves deterministic
+synthetic items and injects TooManyRequests errors above a TPS limit.
+Enable it with PAAPI_FAKE=1 to exercise the fetcher without an account.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import deque
+
+from amazon.exception import AmazonException
+
+import config
+
+THROTTLE_BODY = json.dumps({
+    "__type": "com.amazon.paapi5#TooManyRequestsException",
+    "Errors": [{
+        "Code": "TooManyRequests",
+        "Message": "The request was denied due to request throttling.",
+    }],
+})
+
+
+def fake_item(asin, keywords=""):
+    """Build one synthetic item in the PA API response shape (as dicts)."""
+    seed = int(hashlib.sha256(f"{asin}:{keywords}".encode('utf-8')).hexdigest()[:8], 16)
+    price = 3 + seed % 4000 / 100
+    basis = round(price * (1 + (seed >> 12) % 80 / 100), 2)
+    listing = {
+        "price": {"amount": price, "currency": "USD", "display_amount": f"${price:.2f}"},
+        "delivery_info": {"is_prime_eligible": seed % 2 == 0},
+        "promotions": None,
+    }
+    if basis > price:
+        listing["saving_basis"] = {"amount": basis, "currency": "USD", "display_amount": f"${basis:.2f}"}
+    return {
+        "asin": asin,
+        "detail_page_url": f"https://www.amazon.com/dp/{asin}?tag={config.PARTNER_TAG}",
+        "item_info": {"title": {"display_value": f"{keywords or 'Book'} Volume {seed % 97}"}},
+        "images": {"primary": {"large": {"url": f"https://m.media-amazon.com/images/I/{asin}._SL500_.jpg"}}},
+        "offers": {"listings": [listing]},
+    }
+
+
+class FakeAmazonAPI:
+    """
+    Minimal AmazonAPI replacement with search_items and get_items.
+
+    Every instance shares one request log, so throttling applies across
+    threads and clients the same way the real per-account limit does.
+    """
+
+    _lock = threading.Lock()
+    _requests = deque()
+
+    def __init__(self, tps=None, latency=0.05, total_results=100):
+        self.tps = tps if tps is not None else float(os.getenv("PAAPI_FAKE_TPS", config.API_TPS))
+        self.latency = latency
+        self.total_results = total_results
+        self.calls = 0
+
+    def _admit(self):
+        """Record a request, raising TooManyRequests above the TPS limit."""
+        now = time.monotonic()
+        with self._lock:
+            self.calls += 1
+            while self._requests and now - self._requests[0] > 1.0:
+                self._requests.popleft()
+            if len(self._requests) >= max(1, int(self.tps)):
+                raise AmazonException("ApiException", THROTTLE_BODY)
+            self._requests.append(now)
+        time.sleep(self.latency)
+
+    def search_items(self, keywords=None, item_count=10, item_page=1, **kwargs):
+        self._admit()
+        start = (item_page - 1) * item_count
+        count = max(0, min(item_count, self.total_results - start))
+        prefix = hashlib.sha256((keywords or "").encode('utf-8')).hexdigest()[:5].upper()
+        items = [fake_item(f"B{prefix}{start + i:04d}", keywords) for i in range(count)]
+        return {"data": items, "http_info": None}
+
+    def get_items(self, item_ids=(), get_items_resource=None, **kwargs):
+        self._admit()
+        if len(item_ids) > 10:
+            raise AmazonException("ValueError", "ItemIds can not contain more than 10 items")
+        return {"data": {asin: fake_item(asin) for asin in item_ids}, "http_info": None}
@@ -0,0 +1,265 @@
+"""
+Fast NumPy Compositor
+Blends the deals layout directly in uint8 with precomputed alpha masks and
+streams raw frames into ffmpeg, bypassing MoviePy's per-frame compositing
+
+Run this file directly to benchmark it against the MoviePy renderer:
+    python fast_compositor.py [products.json] [frames]
+"""
+
+import sys
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+import video_config
+import video_segments
+import backgrounds
+import audio_track
+import slide_layout
+import transitions
+
+# Blend terms of the layers many slides share (link text, Prime badge,
+# intro and outro), keyed by raster cache key and bounded as an LRU.
+# Product-specific layers appear on one slide, so theirs aren't kept.
+SHARED_LAYER_CACHE_SIZE = 16
+_prepared = OrderedDict()
+
+
+def blend_terms(raster):
+    """
+    Precompute the blend terms for an RGBA raster.
+
+    Returns:
+        tuple: (premultiplied RGB as uint16, inverse alpha as uint16)
+    """
+    alpha = raster[:, :, 3:4].astype(np.uint16)
+    return raster[:, :, :3].astype(np.uint16) * alpha, 255 - alpha
+
+
+def prepare_layer(layer, raster):
+    """Return the blend terms of a layer, reusing them for shared layers."""
+    if not layer.get("shared"):
+        return blend_terms(raster)
+    key = slide_layout.layer_key(layer)
+    terms = _prepared.get(key)
+    if terms is None:
+        terms = blend_terms(raster)
+        _prepared[key] = terms
+        if len(_prepared) > SHARED_LAYER_CACHE_SIZE:
+            _prepared.popitem(last=False)
+    else:
+        _prepared.move_to_end(key)
+    return terms
+
+
+def resolve_position(position, layer_width, layer_height, width, height):
+    """Turn a layout position (x may be 'center') into pixel coordinates."""
+    x, y = position
+    if x == 'center':
+        x = (width - layer_width) // 2
+    if y == 'center':
+        y = (height - layer_height) // 2
+    return int(x), int(y)
+
+
+def blend_layer(frame, raster, x, y, terms=None):
+    """
+    Alpha-blend an RGBA raster onto a frame in place using integer arithmetic.
+
+    Args:
+        frame: RGB uint8 frame to draw on
+        raster: RGBA uint8 layer
+        x: Left edge of the layer in the frame
+        y: Top edge of the layer in the frame
+        terms: Blend terms from blend_terms() (computed if None)
+    """
+    premultiplied, inverse_alpha = terms if terms is not None else blend_terms(raster)
+    frame_height, frame_width = frame.shape[:2]
+    layer_height, layer_width = raster.shape[:2]
+
+    # Clip the layer to the frame
+    left, top = max(x, 0), max(y, 0)
+    right, bottom = min(x + layer_width, frame_width), min(y + layer_height, frame_height)
+    if left >= right or top >= bottom:
+        return
+
+    src = (slice(top - y, bottom - y), slice(left - x, right - x))
+    region = frame[top:bottom, left:right]
+
+    # (fg * a + bg * (255 - a)) / 255, with the division done as (v + 128) * 257 >> 16
+    blended = premultiplied[src] + region * inverse_alpha[src] + 128
+    blended += blended >> 8
+    region[:] = blended >> 8
+
+
+def compose_frame(kind, product, width, height, out=None):
+    """
+    Composite one slide into a frame buffer.
+
+    Args:
+        kind: "intro", "product" or "outro"
+        product: Product dictionary (only for "product" slides)
+        width: Frame width
+        height: Frame height
+        out: Optional preallocated (height, width, 3) uint8 buffer to reuse
+
+    Returns:
+        numpy.ndarray: The composited frame (out, if given)
+    """
+    if out is None:
+        out = np.empty((height, width, 3), dtype=np.uint8)
+    out[:] = backgrounds.slide_background(width, height)
+
+    for layer in slide_layout.slide_layers(kind, product, width, height):
+        try:
+            raster = slide_layout.render_layer(layer)
+        except Exception as e:
+            print(f"    Warning: Could not create {layer['name']} layer: {e}")
+            continue
+        x, y = resolve_position(layer["position"], raster.shape[1], raster.shape[0], width, height)
+        blend_layer(out, raster, x, y, prepare_layer(layer, raster))
+    return out
+
+
+def stream_slides(process, slides, width, height, fps, timings=None):
+    """
+    Write the frames of a sequence of slides to an ffmpeg frame pipe.
+
+    Two frame buffers are reused for every slide; each slide is composited
+    once and its bytes are written for every frame it is on screen, and
+    only the transition windows between slides are blended frame by frame.
+
+    Args:
+        process: Process from video_segments.open_frame_pipe()
+        slides: List of (kind, product, duration in seconds)
+        width: Frame width
+        height: Frame height
+        fps: Frame rate
+        timings: Optional dict that receives seconds spent compositing
+            ("slides") and writing frames ("encode")
+    """
+    if timings is None:
+        timings = {}
+    window = transitions.frame_count(fps)
+
+    frame = np.empty((height, width, 3), dtype=np.uint8)
+    next_frame = np.empty((height, width, 3), dtype=np.uint8)
+    compose_seconds = write_seconds = 0.0
+
+    start = time.perf_counter()
+    compose_frame(slides[0][0], slides[0][1], width, height, out=frame)
+    compose_seconds += time.perf_counter() - start
+
+    for i, (kind, product, duration) in enumerate(slides, 1):
+        print(f"  [{i}/{len(slides)}] Streaming {kind} slide...")
+        last = i == len(slides)
+        start = time.perf_counter()
+        data = memoryview(frame).cast("B")
+        for _ in range(int(round(duration * fps)) - (0 if last else window)):
+            process.stdin.write(data)
+        write_seconds += time.perf_counter() - start
+        if last:
+            break
+
+        start = time.perf_counter()
+        next_kind, next_product, _ = slides[i]
+        compose_frame(next_kind, next_product, width, height, out=next_frame)
+        compose_seconds += time.perf_counter() - start
+
+        if window:
+            blended_frames = transitions.TransitionRenderer(frame, next_frame).frames(window)
+            for _ in range(window):
+                start = time.perf_counter()
+                blended = next(blended_frames)
+                compose_seconds += time.perf_counter() - start
+
+                start = time.perf_counter()
+                process.stdin.write(memoryview(blended).cast("B"))
+                write_seconds += time.perf_counter() - start
+        frame, next_frame = next_frame, frame
+
+    timings["slides"] = timings.get("slides", 0.0) + compose_seconds
+    timings["encode"] = timings.get("encode", 0.0) + write_seconds
+
+
+def render_numpy_video(deals, output_file, total_duration, timings=None):
+    """
+    Render the video by streaming composited frames straight into ffmpeg.
+
+    Args:
+        deals: List of product dictionaries
+        output_file: Output video filename
+        total_duration: Total video duration in seconds
+        timings: Optional dict that receives seconds spent per stage
+    """
+    width, height, fps = video_config.VIDEO_WIDTH, video_config.VIDEO_HEIGHT, video_config.FPS
+    if timings is None:
+        timings = {}
+
+    start = time.perf_counter()
+    audio_file = audio_track.background_track(total_duration)
+    timings["audio"] = time.perf_counter() - start
+
+    slides = slide_layout.slide_sequence(deals)
+
+    process = video_segments.open_frame_pipe(
+        output_file, width, height, fps, audio_file=audio_file
+    )
+    try:
+        stream_slides(process, slides, width, height, fps, timings)
+    finally:
+        start = time.perf_counter()
+        video_segments.close_frame_pipe(process)
+        timings["encode"] = timings.get("encode", 0.0) + time.perf_counter() - start
+
+
+def benchmark(input_file="products.json", frames=96):
+    """
+    Compare per-frame compositing cost of MoviePy and the NumPy compositor.
+
+    Args:
+        input_file: Path to products.json
+        frames: Frames to composite per slide (96 = one 4 s slide at 24 FPS)
+
+    Returns:
+        dict: Seconds spent per renderer and the speedup
+    """
+    from create_deals_video import build_slide, load_deals
+
+    width, height = video_config.VIDEO_WIDTH, video_config.VIDEO_HEIGHT
+    deals = load_deals(input_file)
+
+    start = time.perf_counter()
+    for product in deals:
+        clip = build_slide("product", product)
+        for n in range(frames):
+            clip.get_frame(n / video_config.FPS)
+        clip.close()
+    moviepy_seconds = time.perf_counter() - start
+
+    frame = np.empty((height, width, 3), dtype=np.uint8)
+    start = time.perf_counter()
+    for product in deals:
+        for _ in range(frames):
+            compose_frame("product", product, width, height, out=frame)
+    numpy_seconds = time.perf_counter() - start
+
+    return {
+        "slides": len(deals),
+        "frames_per_slide": frames,
+        "moviepy_seconds": round(moviepy_seconds, 3),
+        "numpy_seconds": round(numpy_seconds, 3),
+        "speedup": round(moviepy_seconds / numpy_seconds, 1) if numpy_seconds else None,
+    }
+
+
+if __name__ == "__main__":
+    input_file = sys.argv[1] if len(sys.argv) > 1 else "products.json"
+    frames = int(sys.argv[2]) if len(sys.argv) > 2 else 96
+    results = benchmark(input_file, frames)
+    print(f"Composited {results['slides']} slides x {results['frames_per_slide']} frames")
+    print(f"  MoviePy: {results['moviepy_seconds']}s")
+    print(f"  NumPy:   {results['numpy_seconds']}s")
+    print(f"  Speedup: {results['speedup']}x")
@@ -5,189 +5,421 @@ and stores them in a products.json file.
 """
 
 import json
-from datetime import datetime
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from amazon.paapi import AmazonAPI
 
 import config
+import request_scheduler
+from request_scheduler import ScheduledAPIClient
+from fake_paapi import FakeAmazonAPI
+from response_cache import CachedAPIClient
+import product_store
+import item_extractor
+import rank_deals
+import dedupe_products
+import image_cache
+from product_model import parse_percentage
+
+
+# Product fields that come from the offer resources
+OFFER_FIELDS = (
+    "current_price",
+    "original_price",
+    "savings",
+    "savings_percentage",
+    "currency",
+    "is_prime_eligible",
+    "promotions",
+)
+
+# Maximum ASINs per GetItems request
+GET_ITEMS_BATCH = 10
+
+# The SDK's throttling is its own requests-per-second limit per client,
+# applied by sleeping before each call. The request scheduler paces all
+# calls, so the SDK's limit is set far above any real rate to keep it out
+# of the way (it can't be disabled outright).
+SDK_THROTTLING = 1000
 
 
 def get_api_client():
-    """Initialize and return the PA API client."""
-    return AmazonAPI(
-        access_key=config.ACCESS_KEY,
-        secret_key=config.SECRET_KEY,
-        partner_tag=config.PARTNER_TAG,
-        country=config.REGION
-    )
+    """
+    Initialize and return the PA API client.
+    
+    Every client sends its requests through the shared request scheduler,
+    so all clients together stay within the account's rate limits, and
+    answers repeated requests from the response cache when it is enabled.
+    """
+    if config.USE_FAKE_API:
+        client = FakeAmazonAPI()
+    else:
+        client = AmazonAPI(
+            access_key=config.ACCESS_KEY,
+            secret_key=config.SECRET_KEY,
+            partner_tag=config.PARTNER_TAG,
+            country=config.REGION,
+            throttling=SDK_THROTTLING
+        )
+    client = ScheduledAPIClient(client, request_scheduler.get_scheduler())
+    if config.API_CACHE or config.API_OFFLINE:
+        client = CachedAPIClient(client)
+    return client
+
 
+def served_from_cache(api_client):
+    """Return True if the calling thread's last request was answered from the response cache."""
+    check = getattr(api_client, "served_from_cache", None)
+    return bool(check and check())
 
-def search_deals(api_client):
+
+def response_items(items):
     """
-    Search for products with deals using the PA API.
+    Get the list of items out of a search_items response.
+    
+    Args:
+        items: Response from api_client.search_items
+        
+    Returns:
+        list: Items, or None if the response format is unknown
+    """
+    if isinstance(items, dict) and 'data' in items:
+        return items['data']
+    if isinstance(items, list):
+        return items
+    return None
+
+
+def search_page(api_client, keywords, page=1, stop=None):
+    """
+    Fetch one page of search results.
     
     Args:
         api_client: The PA API client instance
+        keywords: Search keywords
+        page: Result page (1-10)
+        stop: Optional threading.Event; once it is set the page is
+            skipped, also while its request waits for the scheduler
         
     Returns:
-        list: List of products with deal information
+        tuple: (products on the page, number of items the API returned),
+            or None if the page was skipped or its request failed
     """
+    request = {}
+    if stop is not None:
+        if stop.is_set():
+            return None
+        request["cancel"] = stop
     try:
-        # Search for items
         items = api_client.search_items(
-            keywords=config.SEARCH_KEYWORDS,
-            item_count=config.MAX_ITEMS
+            keywords=keywords,
+            item_count=config.MAX_ITEMS,
+            item_page=page,
+            **request
         )
+    except request_scheduler.RequestCancelled:
+        return None
+    except Exception as e:
+        print(f"Error calling PA API for '{keywords}' page {page}: {e}")
+        return None
+    
+    products_list = response_items(items)
+    if products_list is None:
+        print("Unknown response format from PA API.")
+        return None
+    
+    cached = served_from_cache(api_client)
+    products = []
+    for item in products_list:
+        product = extract_item(item)
+        if product:
+            product["stale"] = cached
+            products.append(product)
+    return products, len(products_list)
+
+
+def savings_percent(product):
+    """Return a product's savings percentage as a number (0 if unknown)."""
+    return parse_percentage(product.get("savings_percentage")) or 0.0
+
+
+def search_deals(api_client, keywords=None, pages=None, target_deals=None, min_savings=None):
+    """
+    Search for products with deals using the PA API.
+    
+    Pages are requested concurrently (the request scheduler keeps them
+    within the rate limit) and pages whose requests haven't been sent yet
+    are dropped once enough qualifying deals have been collected.
+    
+    Args:
+        api_client: The PA API client instance
+        keywords: Search keywords (defaults to config.SEARCH_KEYWORDS)
+        pages: Maximum result pages to fetch (defaults to config.SEARCH_PAGES)
+        target_deals: Stop after this many qualifying deals (defaults to config.TARGET_DEALS)
+        min_savings: Savings percentage a deal needs to qualify (defaults to config.MIN_SAVINGS_PERCENT)
         
-        print(f"DEBUG: items type: {type(items)}")
-        if isinstance(items, dict) and 'data' in items:
-            products_list = items['data']
-        elif isinstance(items, list):
-            products_list = items
-        else:
-            print("Unknown response format from PA API.")
-            return []
+    Returns:
+        list: List of products with deal information, in page order
+    """
+    if keywords is None:
+        keywords = config.SEARCH_KEYWORDS
+    if pages is None:
+        pages = config.SEARCH_PAGES
+    if target_deals is None:
+        target_deals = config.TARGET_DEALS
+    if min_savings is None:
+        min_savings = config.MIN_SAVINGS_PERCENT
+    
+    # The PA API serves at most 10 pages per search
+    pages = max(1, min(pages, 10))
+    if pages == 1:
+        result = search_page(api_client, keywords)
+        return result[0] if result else []
+    
+    results = {}
+    qualifying = 0
+    # Setting a page's event skips it, even if its request is already
+    # waiting for the scheduler
+    stops = {page: threading.Event() for page in range(1, pages + 1)}
+    with ThreadPoolExecutor(max_workers=min(pages, config.FETCH_WORKERS)) as executor:
+        futures = {executor.submit(search_page, api_client, keywords, page, stops[page]): page
+                   for page in range(1, pages + 1)}
+        for future in as_completed(futures):
+            page = futures[future]
+            result = None if future.cancelled() else future.result()
+            if result is None:
+                # Skipped or failed; a failure says nothing about later pages
+                continue
+            products, item_count = result
+            results[page] = products
+            qualifying += sum(1 for p in products if savings_percent(p) >= min_savings)
             
-        products = []
+            if qualifying >= target_deals:
+                # Enough deals: skip every page that hasn't been sent yet
+                for other, other_page in futures.items():
+                    stops[other_page].set()
+                    other.cancel()
+            elif item_count < config.MAX_ITEMS:
+                # A short page is the last one; later pages would come back empty
+                for other, other_page in futures.items():
+                    if other_page > page:
+                        stops[other_page].set()
+                        other.cancel()
+    
+    fetched = sorted(results)
+    print(f"  {keywords}: fetched {len(fetched)} page(s), {qualifying} deals with {min_savings}%+ savings")
+    return [product for page in fetched for product in results[page]]
+
+
+def merge_products(product_lists):
+    """
+    Merge product lists, keeping the first occurrence of each ASIN.
+    
+    Args:
+        product_lists: Iterable of product lists, in priority order
         
-        # Process each item in the response
-        for item in products_list:
-            product = extract_product_info(item)
-            if product:
-                products.append(product)
+    Returns:
+        list: Combined products without duplicate ASINs
+    """
+    seen = set()
+    merged = []
+    for products in product_lists:
+        for product in products:
+            if product["asin"] in seen:
+                continue
+            seen.add(product["asin"])
+            merged.append(product)
+    return merged
+
+
+def fetch_categories(categories, max_workers=None):
+    """
+    Search several keywords concurrently and merge the results.
+    
+    All worker threads share one API client: the request scheduler paces
+    them together and the response cache is process-wide.
+    
+    Args:
+        categories: List of search keywords
+        max_workers: Concurrent searches (defaults to config.FETCH_WORKERS)
         
+    Returns:
+        list: Combined products, de-duplicated by ASIN
+    """
+    if max_workers is None:
+        max_workers = config.FETCH_WORKERS
+    
+    api_client = get_api_client()
+    
+    def search(keywords):
+        products = search_deals(api_client, keywords)
+        print(f"  {keywords}: {len(products)} products")
         return products
-        
-    except Exception as e:
-        print(f"Error calling PA API: {e}")
-        return []
+    
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        results = list(executor.map(search, categories))
+    
+    products = merge_products(results)
+    total = sum(len(r) for r in results)
+    print(f"Merged {total} results into {len(products)} unique products")
+    return products
 
 
-def extract_product_info(item):
+def extract_product_info(item, require_title=True):
     """
     Extract relevant product information from API response item.
     
     Args:
         item: AmazonProduct object or dictionary from API response
+        require_title: Drop items without a title (off for price-only responses)
         
     Returns:
         dict: Formatted product information
     """
-    try:
-        # Helper to get value from either object attribute or dictionary key
-        def get_val(obj, key, default=None):
-            if isinstance(obj, dict):
-                return obj.get(key, default)
-            return getattr(obj, key, default)
-
-        product = {
-            "asin": get_val(item, 'asin'),
-            "title": None,
-            "current_price": None,
-            "original_price": None,
-            "savings": None,
-            "savings_percentage": None,
-            "currency": None,
-            "is_prime_eligible": False,
-            "promotions": [],
-            "image_url": None,
-            "product_url": get_val(item, 'detail_page_url')
-        }
-        
-        # Extract title
-        item_info = get_val(item, 'item_info')
-        if item_info:
-            title_obj = get_val(item_info, 'title')
-            if title_obj:
-                product["title"] = get_val(title_obj, 'display_value')
-        
-        # Extract image
-        images = get_val(item, 'images')
-        if images:
-            primary = get_val(images, 'primary')
-            if primary:
-                large = get_val(primary, 'large')
-                if large:
-                    product["image_url"] = get_val(large, 'url')
-        
-        # Extract pricing and deal information
-        offers = get_val(item, 'offers')
-        if offers:
-            listings = get_val(offers, 'listings')
-            if listings and len(listings) > 0:
-                listing = listings[0]
-                
-                # Current price
-                price = get_val(listing, 'price')
-                if price:
-                    product["current_price"] = get_val(price, 'display_amount')
-                    product["currency"] = get_val(price, 'currency')
-                
-                # Original price (savings basis)
-                saving_basis = get_val(listing, 'saving_basis')
-                if saving_basis:
-                    product["original_price"] = get_val(saving_basis, 'display_amount')
-                    
-                    # Calculate savings
-                    if price:
-                        price_amount = get_val(price, 'amount')
-                        basis_amount = get_val(saving_basis, 'amount')
-                        if price_amount is not None and basis_amount is not None:
-                            try:
-                                savings_amount = basis_amount - price_amount
-                                if basis_amount > 0:
-                                    savings_pct = (savings_amount / basis_amount) * 100
-                                    currency_symbol = product["currency"] if product["currency"] else "USD"
-                                    product["savings"] = f"{currency_symbol} {savings_amount:.2f}"
-                                    product["savings_percentage"] = f"{savings_pct:.0f}%"
-                            except:
-                                pass
-                
-                # Prime eligibility
-                delivery_info = get_val(listing, 'delivery_info')
-                if delivery_info:
-                    product["is_prime_eligible"] = get_val(delivery_info, 'is_prime_eligible', False)
-                
-                # Promotions
-                promotions = get_val(listing, 'promotions')
-                if promotions:
-                    for promo in promotions:
-                        promo_info = {
-                            "type": get_val(promo, 'type', "Unknown"),
-                            "discount": f"{get_val(promo, 'discount_percent')}%" if get_val(promo, 'discount_percent') else None
-                        }
-                        if promo_info["type"]:
-                            product["promotions"].append(promo_info)
-        
-        # Return product even if no savings, since we want books, toys etc as well
-        # But filter out those without a title or ASIN
-        if product["asin"] and product["title"]:
-            return product
-        
+    (asin, product_url, title, image_url, current_price, currency, price_amount,
+     original_price, basis_amount, is_prime_eligible, promotions) = item_extractor.extract_fields(item)
+    
+    # Return product even if no savings, since we want books, toys etc as well
+    # But filter out those without a title or ASIN
+    if not asin or not (title or not require_title):
         return None
-        
-    except Exception as e:
+    
+    product = {
+        "asin": asin,
+        "title": title,
+        "current_price": current_price,
+        "original_price": original_price,
+        "savings": None,
+        "savings_percentage": None,
+        "currency": currency,
+        "is_prime_eligible": is_prime_eligible if is_prime_eligible is not None else False,
+        "promotions": [],
+        "image_url": image_url,
+        "product_url": product_url
+    }
+    
+    # Calculate savings from the savings basis (a basis at or below the
+    # price is no saving)
+    if price_amount is not None and basis_amount is not None:
+        try:
+            savings_amount = basis_amount - price_amount
+            if basis_amount > 0 and savings_amount > 0:
+                savings_pct = (savings_amount / basis_amount) * 100
+                currency_symbol = currency if currency else "USD"
+                product["savings"] = f"{currency_symbol} {savings_amount:.2f}"
+                product["savings_percentage"] = f"{savings_pct:.0f}%"
+        except (TypeError, ValueError) as e:
+            print(f"Warning: Can't compute savings for {asin}: {e}")
+    
+    if promotions:
+        for promo in promotions:
+            discount = item_extractor.read(promo, 'discount_percent')
+            promo_info = {
+                "type": item_extractor.read(promo, 'type', "Unknown"),
+                "discount": f"{discount}%" if discount else None
+            }
+            if promo_info["type"]:
+                product["promotions"].append(promo_info)
+    
+    return product
+
+
+def extract_item(item, require_title=True):
+    """
+    Extract one item like extract_product_info, skipping it if it is malformed.
+    
+    Returns:
+        dict: Formatted product information, or None if the item was skipped
+    """
+    try:
+        return extract_product_info(item, require_title)
+    except (AttributeError, TypeError, IndexError) as e:
         print(f"Error extracting product info: {e}")
         return None
 
 
-def save_to_json(products, filename="products.json"):
+def reprice_products(products, api_client=None, max_workers=None):
+    """
+    Refresh prices of known products in place with batched GetItems calls.
+    
+    ASINs are sent 10 per request (the PA API maximum) and only the offer
+    resources are requested, so a refresh costs one call per 10 products.
+    
+    Args:
+        products: List of product dictionaries (updated in place)
+        api_client: The PA API client instance (defaults to get_api_client())
+        max_workers: Concurrent batches (defaults to config.FETCH_WORKERS)
+        
+    Returns:
+        int: Number of products whose offer data was refreshed
+    """
+    if api_client is None:
+        api_client = get_api_client()
+    if max_workers is None:
+        max_workers = config.FETCH_WORKERS
+    
+    by_asin = {p["asin"]: p for p in products if p.get("asin")}
+    asins = list(by_asin)
+    batches = [asins[i:i + GET_ITEMS_BATCH] for i in range(0, len(asins), GET_ITEMS_BATCH)]
+    
+    # Products keep their old prices until a live response refreshes them
+    for product in by_asin.values():
+        product["stale"] = True
+    
+    def fetch_batch(batch):
+        try:
+            response = api_client.get_items(
+                item_ids=batch,
+                get_items_resource=config.PRICE_RESOURCES,
+                priority=request_scheduler.PRIORITY_REPRICE
+            )
+        except Exception as e:
+            print(f"Error calling PA API GetItems for {len(batch)} ASINs: {e}")
+            return [], False
+        items = response.get('data') if isinstance(response, dict) else response
+        if isinstance(items, dict):
+            items = list(items.values())
+        return items or [], served_from_cache(api_client)
+    
+    print(f"Re-pricing {len(asins)} products in {len(batches)} GetItems calls...")
+    updated = 0
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for items, cached in executor.map(fetch_batch, batches):
+            for item in items:
+                fresh = extract_item(item, require_title=False)
+                if not fresh or fresh["asin"] not in by_asin:
+                    continue
+                product = by_asin[fresh["asin"]]
+                for field in OFFER_FIELDS:
+                    product[field] = fresh[field]
+                product["stale"] = cached
+                updated += 1
+    
+    print(f"Updated prices for {updated} of {len(asins)} products")
+    return updated
+
+
+def save_to_json(products, filename="products.json", selected=None):
     """
-    Save products to JSON file.
+    Record products in the product store and export them to JSON.
+    
+    The store keeps every run's prices; products.json is written as a
+    view of the run just recorded.
     
     Args:
         products: List of product dictionaries
         filename: Output filename
+        selected: Products to export, in this order (defaults to all of them)
     """
-    output = {
-        "fetch_timestamp": datetime.now().isoformat(),
-        "total_deals": len(products),
-        "products": products
-    }
-    
-    with open(filename, 'w', encoding='utf-8') as f:
-        json.dump(output, f, indent=2, ensure_ascii=False)
+    asins = [p['asin'] for p in selected] if selected is not None else None
+    conn = product_store.connect()
+    try:
+        run_id = product_store.upsert_products(conn, products)
+        count = product_store.export_json(conn, filename, run_id, asins)
+    finally:
+        conn.close()
     
-    print(f"Successfully saved {len(products)} deals to {filename}")
+    print(f"Successfully saved {count} deals to {filename} (run {run_id} in {config.PRODUCT_DB})")
 
 
 import sys
@@ -200,18 +432,30 @@ def main():
     print("=" * 60)
     
     # Check for keywords in command line arguments
+    # "all" searches every category, "A; B; C" searches each keyword,
+    # "reprice" refreshes the prices of the products already in products.json
     keywords = None
+    categories = None
     if len(sys.argv) > 1:
-        arg_str = " ".join(sys.argv[1:]).lower()
-        if arg_str == "random":
+        arg_str = " ".join(sys.argv[1:])
+        if arg_str.lower() == "reprice":
+            reprice_main()
+            return
+        if arg_str.lower() == "random":
             keywords = random.choice(config.BOOK_CATEGORIES)
             print(f"Randomly selected category: {keywords}")
+        elif arg_str.lower() == "all":
+            categories = list(config.BOOK_CATEGORIES)
+            print(f"Searching all {len(categories)} categories")
+        elif ";" in arg_str:
+            categories = [k.strip() for k in arg_str.split(";") if k.strip()]
+            print(f"Searching {len(categories)} keywords from command line")
         else:
-            keywords = " ".join(sys.argv[1:])
+            keywords = arg_str
             print(f"Using search keywords from command line: {keywords}")
     
     # Default behavior if no keywords provided
-    if not keywords:
+    if not keywords and not categories:
         keywords = random.choice(config.BOOK_CATEGORIES)
         print(f"No keywords provided. Using random category: {keywords}")
 
@@ -225,43 +469,32 @@ def main():
     print(f"Marketplace: {config.MARKETPLACE}")
     print(f"Max items: {config.MAX_ITEMS}\n")
     
-    # Initialize API client
-    api_client = get_api_client()
-    
-    # Fetch deals
-    print(f"Fetching '{keywords}' from Amazon...")
-    
-    # Process products
-    products = []
-    try:
-        # Search for items
-        items = api_client.search_items(
-            keywords=keywords,
-            item_count=config.MAX_ITEMS
-        )
+    if categories:
+        # Fan out over all keywords at once
+        print(f"Fetching {len(categories)} keywords with {config.FETCH_WORKERS} workers...")
+        products = fetch_categories(categories)
+    else:
+        # Initialize API client
+        api_client = get_api_client()
         
-        if isinstance(items, dict) and 'data' in items:
-            products_list = items['data']
-        elif isinstance(items, list):
-            products_list = items
-        else:
-            print("Unknown response format from PA API.")
-            return
-            
-        # Process each item
-        for item in products_list:
-            product = extract_product_info(item)
-            if product:
-                products.append(product)
-                
-    except Exception as e:
-        print(f"Error calling PA API: {e}")
+        # Fetch deals
+        print(f"Fetching '{keywords}' from Amazon...")
+        products = search_deals(api_client, keywords)
     
     if products:
         print(f"\nFound {len(products)} products!")
         
-        # Save to JSON
-        save_to_json(products)
+        if config.DEDUPE_PRODUCTS:
+            products = dedupe_products.dedupe_products(products)
+        candidates = products
+        if config.RANK_DEALS:
+            products = rank_deals.rank_products(candidates)
+        
+        # Record every candidate's price, export only the deals that made the cut
+        save_to_json(candidates, selected=products)
+        
+        if config.PREFETCH_IMAGES:
+            image_cache.prefetch_images(products)
         
         # Display summary
         print("\n" + "=" * 60)
@@ -280,5 +513,16 @@ def main():
     print("=" * 60)
 
 
+def reprice_main(filename="products.json"):
+    """Refresh prices of the products in products.json and save them."""
+    with open(filename, 'r', encoding='utf-8') as f:
+        products = json.load(f)['products']
+    
+    if reprice_products(products):
+        save_to_json(products, filename)
+    else:
+        print("No prices were updated.")
+
+
 if __name__ == "__main__":
     main()
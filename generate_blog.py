@@ -1,6 +1,10 @@
 import json
+import os
 from datetime import datetime
 
+import config
+import image_cache
+
 def generate_blog(input_file="products.json", output_file="index.html"):
     """
     Generate a static HTML blog page from products.json data.
@@ -10,6 +14,8 @@ def generate_blog(input_file="products.json", output_file="index.html"):
             data = json.load(f)
         
         products = data.get('products', [])
+        image_index = image_cache.load_index() if config.BLOG_LOCAL_IMAGES else None
+        page_dir = os.path.dirname(os.path.abspath(output_file))
         fetch_timestamp = data.get('fetch_timestamp', '')
         formatted_date = datetime.fromisoformat(fetch_timestamp).strftime('%B %d, %Y - %I:%M %p') if fetch_timestamp else "Recently"
         
@@ -144,6 +150,11 @@ def generate_blog(input_file="products.json", output_file="index.html"):
         for product in products:
             title = product.get('title', 'Amazon Product')
             image_url = product.get('image_url', '')
+            if image_index is not None:
+                # Serve the cached copy next to the page instead of hot-linking Amazon
+                local_image = image_cache.local_image_path(image_url, image_index)
+                if local_image:
+                    image_url = os.path.relpath(local_image, page_dir).replace(os.sep, '/')
             product_url = product.get('product_url', '#')
             price = product.get('current_price', 'Price not available')
             savings = product.get('savings_percentage', '')
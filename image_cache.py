@@ -0,0 +1,262 @@
+"""
+Product Image Cache
+Downloads product images concurrently over one pooled HTTP session and
+stores them by content hash, so the video and blog can use local copies.
+An index maps each image URL to its file and validators (ETag and
+Last-Modified); known images are re-validated with conditional requests
+and are only downloaded again if they changed.
+
+Usage:
+    python image_cache.py [products.json]
+"""
+
+import hashlib
+import json
+import mimetypes
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from email.utils import formatdate
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+import config
+
+INDEX_FILENAME = "index.json"
+DEFAULT_EXTENSION = ".jpg"
+
+
+def create_session(pool_size=None):
+    """Create an HTTP session whose connection pool fits every worker."""
+    if pool_size is None:
+        pool_size = config.IMAGE_WORKERS
+    session = requests.Session()
+    retry = Retry(total=2, backoff_factor=0.5, status_forcelist=(429, 500, 502, 503, 504))
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers["User-Agent"] = "amazon-deals-video/1.0"
+    return session
+
+
+def load_index(cache_dir=None):
+    """Return the URL index of the cache (empty if there is none yet)."""
+    if cache_dir is None:
+        cache_dir = config.IMAGE_CACHE_DIR
+    try:
+        with open(os.path.join(cache_dir, INDEX_FILENAME), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError) as e:
+        print(f"Warning: Ignoring unreadable image index: {e}")
+        return {}
+
+
+def save_index(index, cache_dir=None):
+    """Write the URL index atomically."""
+    if cache_dir is None:
+        cache_dir = config.IMAGE_CACHE_DIR
+    os.makedirs(cache_dir, exist_ok=True)
+    path = os.path.join(cache_dir, INDEX_FILENAME)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(index, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+def image_extension(url, content_type=None):
+    """Pick a file extension from the response content type or the URL."""
+    if content_type:
+        extension = mimetypes.guess_extension(content_type.split(";")[0].strip())
+        if extension:
+            return ".jpg" if extension in (".jpe", ".jpeg") else extension
+    extension = os.path.splitext(url.split("?")[0])[1].lower()
+    return extension if extension in (".jpg", ".jpeg", ".png", ".gif", ".webp") else DEFAULT_EXTENSION
+
+
+def fetch_image(session, url, entry, cache_dir, revalidate_after):
+    """
+    Make sure one image is in the cache.
+
+    Args:
+        session: HTTP session
+        url: Image URL
+        entry: Index entry from a previous run, or None
+        cache_dir: Cache directory
+        revalidate_after: Seconds before a cached image is checked again
+
+    Returns:
+        tuple: (status, entry) where status is "fresh", "not-modified",
+            "downloaded" or "failed"
+    """
+    cached_file = os.path.join(cache_dir, entry["file"]) if entry else None
+    if cached_file and not os.path.exists(cached_file):
+        entry, cached_file = None, None
+
+    now = time.time()
+    if entry and now - entry.get("checked_at", 0) < revalidate_after:
+        return "fresh", entry
+
+    headers = {}
+    if entry:
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        elif "If-None-Match" not in headers:
+            headers["If-Modified-Since"] = formatdate(entry.get("checked_at", 0), usegmt=True)
+
+    try:
+        response = session.get(url, headers=headers, timeout=config.IMAGE_TIMEOUT)
+    except requests.RequestException as e:
+        print(f"Warning: Could not download {url}: {e}")
+        return "failed", entry
+
+    if response.status_code == 304 and entry:
+        return "not-modified", dict(entry, checked_at=now)
+    if response.status_code != 200 or not response.content:
+        print(f"Warning: Could not download {url}: HTTP {response.status_code}")
+        return "failed", entry
+
+    digest = hashlib.sha256(response.content).hexdigest()
+    filename = digest[:32] + image_extension(url, response.headers.get("Content-Type"))
+    path = os.path.join(cache_dir, filename)
+    if not os.path.exists(path):
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(response.content)
+        os.replace(tmp_path, path)
+
+    return "downloaded", {
+        "file": filename,
+        "etag": response.headers.get("ETag"),
+        "last_modified": response.headers.get("Last-Modified"),
+        "size": len(response.content),
+        "checked_at": now,
+    }
+
+
+def prefetch_images(products, workers=None, session=None, cache_dir=None, revalidate_after=None):
+    """
+    Download or re-validate the images of a list of products.
+
+    Args:
+        products: Product dictionaries with an image_url
+        workers: Concurrent downloads (defaults to config.IMAGE_WORKERS)
+        session: HTTP session (a pooled one is created if None)
+        cache_dir: Cache directory (defaults to config.IMAGE_CACHE_DIR)
+        revalidate_after: Seconds before cached images are checked again
+            (defaults to config.IMAGE_REVALIDATE_AFTER)
+
+    Returns:
+        dict: image_url -> local file path for every cached image
+    """
+    if workers is None:
+        workers = config.IMAGE_WORKERS
+    if cache_dir is None:
+        cache_dir = config.IMAGE_CACHE_DIR
+    if revalidate_after is None:
+        revalidate_after = config.IMAGE_REVALIDATE_AFTER
+    own_session = session is None
+    if own_session:
+        session = create_session(workers)
+
+    urls = list(dict.fromkeys(p["image_url"] for p in products if p.get("image_url")))
+    os.makedirs(cache_dir, exist_ok=True)
+    index = load_index(cache_dir)
+
+    def fetch(url):
+        return url, fetch_image(session, url, index.get(url), cache_dir, revalidate_after)
+
+    counts = {}
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+            for url, (status, entry) in executor.map(fetch, urls):
+                counts[status] = counts.get(status, 0) + 1
+                if entry:
+                    index[url] = entry
+    finally:
+        if own_session:
+            session.close()
+
+    evict(index, cache_dir)
+    save_index(index, cache_dir)
+    summary = ", ".join(f"{count} {status}" for status, count in sorted(counts.items()))
+    print(f"Images: {len(urls)} URLs ({summary or 'nothing to do'})")
+    return {url: os.path.join(cache_dir, index[url]["file"]) for url in urls if url in index}
+
+
+def local_image_path(url, index=None, cache_dir=None):
+    """
+    Return the cached file for an image URL, or None if it isn't cached.
+
+    Args:
+        url: Image URL
+        index: Index from load_index() (loaded if None)
+        cache_dir: Cache directory (defaults to config.IMAGE_CACHE_DIR)
+    """
+    if not url:
+        return None
+    if cache_dir is None:
+        cache_dir = config.IMAGE_CACHE_DIR
+    if index is None:
+        index = load_index(cache_dir)
+    entry = index.get(url)
+    if not entry:
+        return None
+    path = os.path.join(cache_dir, entry["file"])
+    return path if os.path.exists(path) else None
+
+
+def evict(index, cache_dir=None, max_bytes=None):
+    """
+    Remove the least recently checked images until the cache fits in max_bytes.
+
+    Index entries of removed files are dropped; files no entry points to
+    are removed first.
+    """
+    if cache_dir is None:
+        cache_dir = config.IMAGE_CACHE_DIR
+    if max_bytes is None:
+        max_bytes = config.IMAGE_CACHE_MAX_BYTES
+
+    referenced = {}
+    for url, entry in index.items():
+        referenced.setdefault(entry["file"], []).append(url)
+
+    files = []
+    for name in os.listdir(cache_dir):
+        if name == INDEX_FILENAME or name.endswith(".tmp"):
+            continue
+        path = os.path.join(cache_dir, name)
+        urls = referenced.get(name, [])
+        checked_at = max((index[url].get("checked_at", 0) for url in urls), default=-1)
+        files.append((checked_at, os.path.getsize(path), name, urls))
+
+    total = sum(size for _, size, _, _ in files)
+    for checked_at, size, name, urls in sorted(files):
+        if total <= max_bytes and checked_at >= 0:
+            continue
+        try:
+            os.remove(os.path.join(cache_dir, name))
+        except OSError:
+            continue
+        for url in urls:
+            index.pop(url, None)
+        total -= size
+
+
+def main():
+    """Prefetch the images of the products in products.json."""
+    filename = sys.argv[1] if len(sys.argv) > 1 else "products.json"
+    with open(filename, 'r', encoding='utf-8') as f:
+        products = json.load(f)['products']
+    prefetch_images(products)
+
+
+if __name__ == "__main__":
+    main()
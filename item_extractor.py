@@ -0,0 +1,100 @@
+"""
+PA API Item Extractor
+Pulls the fields products.json needs out of a PA API item in one pass.
+The field paths below are compiled once per response shape (plain dicts
+from cached/fake responses, attribute objects from the SDK) into a flat
+function, so extracting an item is a straight run of lookups.
+"""
+
+# Output field -> path into the item. Integers index into lists.
+LISTING = ("offers", "listings", 0)
+FIELD_PATHS = (
+    ("asin", ("asin",)),
+    ("product_url", ("detail_page_url",)),
+    ("title", ("item_info", "title", "display_value")),
+    ("image_url", ("images", "primary", "large", "url")),
+    ("current_price", LISTING + ("price", "display_amount")),
+    ("currency", LISTING + ("price", "currency")),
+    ("price_amount", LISTING + ("price", "amount")),
+    ("original_price", LISTING + ("saving_basis", "display_amount")),
+    ("basis_amount", LISTING + ("saving_basis", "amount")),
+    ("is_prime_eligible", LISTING + ("delivery_info", "is_prime_eligible")),
+    ("promotions", LISTING + ("promotions",)),
+)
+
+FIELD_NAMES = tuple(name for name, _ in FIELD_PATHS)
+
+# How one step of a path is read for each response shape
+ACCESSORS = {
+    "dict": "{obj}.get({key!r})",
+    "object": "getattr({obj}, {key!r}, None)",
+}
+
+_compiled = {}
+_shape_by_type = {}
+
+
+def generate_source(shape):
+    """
+    Generate the source of the extractor function for a response shape.
+
+    Paths sharing a prefix share the lookups, and every step is guarded
+    so a missing level yields None instead of raising.
+    """
+    accessor = ACCESSORS[shape]
+    lines = ["def extract(item):"]
+    variables = {(): "item"}
+    results = []
+    for _, path in FIELD_PATHS:
+        for depth in range(1, len(path) + 1):
+            prefix = path[:depth]
+            if prefix in variables:
+                continue
+            parent = variables[path[:depth - 1]]
+            key = path[depth - 1]
+            name = f"v{len(variables)}"
+            if isinstance(key, int):
+                lookup = f"{parent}[{key}] if {parent} and len({parent}) > {key} else None"
+            else:
+                lookup = f"{accessor.format(obj=parent, key=key)} if {parent} else None"
+            lines.append(f"    {name} = {lookup}")
+            variables[prefix] = name
+        results.append(variables[path])
+    lines.append(f"    return ({', '.join(results)},)")
+    return "\n".join(lines) + "\n"
+
+
+def compile_extractor(shape):
+    """Compile (once) and return the extractor function for a response shape."""
+    if shape not in _compiled:
+        namespace = {}
+        exec(compile(generate_source(shape), f"<item_extractor:{shape}>", "exec"), namespace)
+        _compiled[shape] = namespace["extract"]
+    return _compiled[shape]
+
+
+def response_shape(item):
+    """Return "dict" for plain dictionaries, otherwise "object"."""
+    item_type = type(item)
+    shape = _shape_by_type.get(item_type)
+    if shape is None:
+        shape = "dict" if isinstance(item, dict) else "object"
+        _shape_by_type[item_type] = shape
+    return shape
+
+
+def extract_fields(item):
+    """
+    Read every schema field of an item.
+
+    Returns:
+        tuple: Values in FIELD_NAMES order (None where missing)
+    """
+    return compile_extractor(response_shape(item))(item)
+
+
+def read(obj, key, default=None):
+    """Read one attribute or key, for the few nested values outside the schema."""
+    if isinstance(obj, dict):
+        return obj.get(key, default)
+    return getattr(obj, key, default)
@@ -0,0 +1,260 @@
+"""
+Draft Preview
+Renders selected slides with the NumPy compositor at reduced resolution
+and frame rate, for checking a layout change without a full render: a
+contact sheet PNG, a short low-bitrate clip (draft encoder profile, no
+audio) and the full-resolution YouTube thumbnail image.
+
+Slides are numbered in video order: 0 is the intro, 1..N the products
+and N+1 the outro.
+
+Usage:
+    python preview.py                          # contact sheet of the first slides
+    python preview.py --slides 0 3 5 --clip    # sheet and clip of selected slides
+    python preview.py --rendition shorts --no-sheet --thumbnail
+"""
+
+import argparse
+import math
+import time
+
+from PIL import Image, ImageDraw
+
+import video_config
+import video_segments
+import fast_compositor
+import renditions
+import slide_layout
+from create_deals_video import load_deals
+
+TILE_GAP = 8  # Pixels between contact sheet tiles
+LABEL_HEIGHT = 20  # Pixels above each tile for its label
+
+
+def select_slides(deals, indexes=None, count=None):
+    """
+    Pick the slides to preview.
+
+    Args:
+        deals: List of product dictionaries
+        indexes: Slide numbers (0 = intro); the first slides if None
+        count: Number of first slides (defaults to video_config.PREVIEW_SLIDES)
+
+    Returns:
+        list: (index, kind, product, duration) per selected slide
+    """
+    slides = slide_layout.slide_sequence(deals)
+    if indexes is None:
+        if count is None:
+            count = video_config.PREVIEW_SLIDES
+        indexes = range(min(count, len(slides)))
+    invalid = [i for i in indexes if not 0 <= i < len(slides)]
+    if invalid:
+        raise ValueError(f"No slide {', '.join(map(str, invalid))}; the video has slides 0-{len(slides) - 1}")
+    return [(i,) + slides[i] for i in indexes]
+
+
+def preview_settings(scale=None, fps=None):
+    """
+    Return the video_config overrides for a draft preview of the current rendition.
+
+    The size is rounded to even numbers, which yuv420p encoding needs.
+    """
+    if scale is None:
+        scale = video_config.PREVIEW_SCALE
+    if fps is None:
+        fps = video_config.PREVIEW_FPS
+    return {
+        "VIDEO_WIDTH": max(2, int(video_config.VIDEO_WIDTH * scale) // 2 * 2),
+        "VIDEO_HEIGHT": max(2, int(video_config.VIDEO_HEIGHT * scale) // 2 * 2),
+        "FPS": fps,
+        "ENCODER_PROFILE": video_config.PREVIEW_ENCODER_PROFILE,
+    }
+
+
+def render_frames(slides):
+    """Composite each selected slide once at the configured size."""
+    width, height = video_config.VIDEO_WIDTH, video_config.VIDEO_HEIGHT
+    return [fast_compositor.compose_frame(kind, product, width, height) for _, kind, product, _ in slides]
+
+
+def contact_sheet(frames, labels, columns=None):
+    """
+    Lay frames out in a labelled grid.
+
+    Args:
+        frames: RGB frames of the same size
+        labels: One label per frame
+        columns: Tiles per row (defaults to video_config.PREVIEW_COLUMNS)
+
+    Returns:
+        PIL.Image.Image: The contact sheet
+    """
+    if columns is None:
+        columns = video_config.PREVIEW_COLUMNS
+    columns = max(1, min(columns, len(frames)))
+    rows = math.ceil(len(frames) / columns)
+    height, width = frames[0].shape[:2]
+    cell_width, cell_height = width + TILE_GAP, height + LABEL_HEIGHT + TILE_GAP
+
+    sheet = Image.new("RGB", (columns * cell_width + TILE_GAP, rows * cell_height + TILE_GAP), (0, 0, 0))
+    draw = ImageDraw.Draw(sheet)
+    for n, (frame, label) in enumerate(zip(frames, labels)):
+        x = TILE_GAP + (n % columns) * cell_width
+        y = TILE_GAP + (n // columns) * cell_height
+        draw.text((x, y + 4), label, fill=(200, 200, 200))
+        sheet.paste(Image.fromarray(frame), (x, y + LABEL_HEIGHT))
+    return sheet
+
+
+def slide_label(index, kind, product):
+    """Return the contact sheet label of a slide."""
+    if kind == "product":
+        return f"#{index} {product.get('title', '')[:40]}"
+    return f"#{index} {kind}"
+
+
+def write_contact_sheet(slides, filename=None, columns=None):
+    """
+    Render the selected slides into a contact sheet PNG.
+
+    Returns:
+        str: Path of the written image
+    """
+    if filename is None:
+        filename = video_config.PREVIEW_FILENAME
+    frames = render_frames(slides)
+    labels = [slide_label(index, kind, product) for index, kind, product, _ in slides]
+    contact_sheet(frames, labels, columns).save(filename)
+    return filename
+
+
+def write_clip(slides, filename=None):
+    """
+    Encode the selected slides (with transitions) as a short silent clip.
+
+    Returns:
+        str: Path of the written clip
+    """
+    if filename is None:
+        filename = video_config.PREVIEW_CLIP_FILENAME
+    width, height, fps = video_config.VIDEO_WIDTH, video_config.VIDEO_HEIGHT, video_config.FPS
+    process = video_segments.open_frame_pipe(filename, width, height, fps)
+    try:
+        fast_compositor.stream_slides(process, [slide[1:] for slide in slides], width, height, fps)
+    finally:
+        video_segments.close_frame_pipe(process)
+    return filename
+
+
+def write_thumbnail(deals, filename=None, index=None):
+    """
+    Render one slide at full resolution as the YouTube thumbnail.
+
+    Args:
+        deals: List of product dictionaries
+        filename: JPEG path (defaults to video_config.THUMBNAIL_FILENAME)
+        index: Slide number (defaults to the first product, else the intro)
+
+    Returns:
+        str: Path of the written image
+    """
+    if filename is None:
+        filename = video_config.THUMBNAIL_FILENAME
+    if index is None:
+        index = 1 if deals else 0
+    frame = render_frames(select_slides(deals, [index]))[0]
+    Image.fromarray(frame).save(filename, quality=video_config.THUMBNAIL_QUALITY, optimize=True)
+    return filename
+
+
+def preview(input_file="products.json", indexes=None, count=None, rendition=None, sheet=None, clip=None,
+            thumbnail=None, thumbnail_slide=None, scale=None, fps=None, columns=None):
+    """
+    Write the requested preview outputs.
+
+    Args:
+        input_file: Path to products.json
+        indexes: Slide numbers to preview (the first slides if None)
+        count: Number of first slides (defaults to video_config.PREVIEW_SLIDES)
+        rendition: Rendition to preview (defaults to the first of video_config.OUTPUT_RENDITIONS)
+        sheet: Contact sheet path, or None to skip it
+        clip: Clip path, or None to skip it
+        thumbnail: Thumbnail path, or None to skip it
+        thumbnail_slide: Slide number for the thumbnail (the first product if None)
+        scale: Fraction of the rendition's resolution (defaults to video_config.PREVIEW_SCALE)
+        fps: Clip frame rate (defaults to video_config.PREVIEW_FPS)
+        columns: Contact sheet tiles per row
+
+    Returns:
+        dict: Seconds spent per output
+    """
+    if rendition is None:
+        rendition = renditions.rendition_names()[0]
+    renditions.rendition_names([rendition])
+    deals = load_deals(input_file)
+    slides = select_slides(deals, indexes, count)
+
+    timings = {}
+    with renditions.applied(renditions.rendition_settings(rendition)):
+        if thumbnail:
+            start = time.perf_counter()
+            write_thumbnail(deals, thumbnail, thumbnail_slide)
+            timings["thumbnail"] = time.perf_counter() - start
+            print(f"Thumbnail: {thumbnail} ({video_config.VIDEO_WIDTH}x{video_config.VIDEO_HEIGHT})")
+
+        with renditions.applied(preview_settings(scale, fps)):
+            size = f"{video_config.VIDEO_WIDTH}x{video_config.VIDEO_HEIGHT}"
+            if sheet:
+                start = time.perf_counter()
+                write_contact_sheet(slides, sheet, columns)
+                timings["sheet"] = time.perf_counter() - start
+                print(f"Contact sheet: {sheet} ({len(slides)} slides at {size})")
+            if clip:
+                start = time.perf_counter()
+                write_clip(slides, clip)
+                timings["clip"] = time.perf_counter() - start
+                print(f"Clip: {clip} ({len(slides)} slides at {size}, {video_config.FPS} FPS)")
+
+    for output, seconds in timings.items():
+        per_slide = seconds if output == "thumbnail" else seconds / len(slides)
+        print(f"  {output}: {seconds:.2f}s ({per_slide * 1000:.0f} ms per slide)")
+    return timings
+
+
+def main():
+    """Parse the command line and write the previews."""
+    parser = argparse.ArgumentParser(description="Preview slides without a full render.")
+    parser.add_argument("input", nargs="?", default="products.json", help="Products file")
+    parser.add_argument("--slides", type=int, nargs="+", help="Slide numbers to preview (0 = intro)")
+    parser.add_argument("--first", type=int, help="Preview the first N slides")
+    parser.add_argument("--rendition", help="Rendition to preview")
+    parser.add_argument("--sheet", default=video_config.PREVIEW_FILENAME, help="Contact sheet PNG")
+    parser.add_argument("--no-sheet", action="store_true", help="Skip the contact sheet")
+    parser.add_argument("--clip", nargs="?", const=video_config.PREVIEW_CLIP_FILENAME,
+                        help="Also write a low-bitrate clip")
+    parser.add_argument("--thumbnail", nargs="?", const=video_config.THUMBNAIL_FILENAME,
+                        help="Also write the YouTube thumbnail")
+    parser.add_argument("--thumbnail-slide", type=int, help="Slide number for the thumbnail")
+    parser.add_argument("--scale", type=float, help="Fraction of the rendition's resolution")
+    parser.add_argument("--fps", type=int, help="Clip frame rate")
+    parser.add_argument("--columns", type=int, help="Contact sheet tiles per row")
+    args = parser.parse_args()
+
+    try:
+        preview(
+            args.input, args.slides, args.first, args.rendition,
+            sheet=None if args.no_sheet else args.sheet,
+            clip=args.clip,
+            thumbnail=args.thumbnail,
+            thumbnail_slide=args.thumbnail_slide,
+            scale=args.scale,
+            fps=args.fps,
+            columns=args.columns,
+        )
+    except ValueError as e:
+        parser.error(str(e))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,210 @@
+"""
+Product Model
+Compact product record with numeric price fields. Amounts are integer
+minor units (cents) and percentages are floats, so sorting and filtering
+never re-parse display strings. Converts losslessly to and from the
+products.json schema.
+"""
+
+import re
+import sys
+
+# Order of fields in products.json
+JSON_FIELDS = (
+    "asin",
+    "title",
+    "current_price",
+    "original_price",
+    "savings",
+    "savings_percentage",
+    "currency",
+    "is_prime_eligible",
+    "promotions",
+    "image_url",
+    "product_url",
+)
+
+# Currencies without a minor unit; everything else uses 2 decimals
+ZERO_DECIMAL_CURRENCIES = {"JPY", "KRW", "CLP", "VND"}
+
+_NUMBER = re.compile(r"-?\d[\d.,]*")
+
+
+def minor_unit_digits(currency):
+    """Return how many decimals a currency's minor unit has."""
+    return 0 if currency in ZERO_DECIMAL_CURRENCIES else 2
+
+
+def parse_amount(display, currency=None):
+    """
+    Convert a display amount to integer minor units.
+
+    Handles "$26.49", "USD 18.50", "USD -2.00", "1,299.00" and "1.299,00 €" styles.
+
+    Returns:
+        int: Amount in minor units, or None if there is no number
+    """
+    if not display:
+        return None
+    match = _NUMBER.search(str(display))
+    if not match:
+        return None
+    number = match.group().rstrip(".,")
+    last_dot, last_comma = number.rfind("."), number.rfind(",")
+    if last_comma > last_dot and len(number) - last_comma - 1 != 3:
+        # Comma is the decimal separator
+        number = number.replace(".", "").replace(",", ".")
+    else:
+        number = number.replace(",", "")
+    return int(round(float(number) * 10 ** minor_unit_digits(currency)))
+
+
+def parse_percentage(display):
+    """Convert "41%" to 41.0 (None if missing or not a number)."""
+    if display is None or display == "":
+        return None
+    try:
+        return float(str(display).rstrip("%"))
+    except ValueError:
+        return None
+
+
+class Product:
+    """
+    One deal. Prices are stored as integer minor units.
+
+    The API's localized display strings for the current and original
+    price are kept as-is; savings strings are rebuilt from the numbers.
+    Anything that doesn't round-trip exactly (and any unknown JSON keys)
+    is kept aside so to_dict() reproduces the input.
+    """
+
+    __slots__ = (
+        "asin",
+        "title",
+        "price_cents",
+        "price_display",
+        "original_cents",
+        "original_display",
+        "savings_cents",
+        "savings_currency",
+        "savings_pct",
+        "currency",
+        "is_prime_eligible",
+        "promotions",
+        "image_url",
+        "product_url",
+        "_raw",
+        "_extra",
+    )
+
+    def __init__(self, asin, title=None, price_cents=None, price_display=None,
+                 original_cents=None, original_display=None, savings_cents=None,
+                 savings_currency=None, savings_pct=None, currency=None,
+                 is_prime_eligible=False, promotions=None, image_url=None, product_url=None):
+        self.asin = asin
+        self.title = title
+        self.price_cents = price_cents
+        self.price_display = price_display
+        self.original_cents = original_cents
+        self.original_display = original_display
+        self.savings_cents = savings_cents
+        self.savings_currency = savings_currency
+        self.savings_pct = savings_pct
+        self.currency = currency
+        self.is_prime_eligible = is_prime_eligible
+        self.promotions = promotions if promotions is not None else []
+        self.image_url = image_url
+        self.product_url = product_url
+        self._raw = None
+        self._extra = None
+
+    @classmethod
+    def from_dict(cls, data):
+        """Build a Product from a products.json product dictionary."""
+        currency = data.get("currency")
+        product = cls(
+            asin=data.get("asin"),
+            title=data.get("title"),
+            price_cents=parse_amount(data.get("current_price"), currency),
+            price_display=data.get("current_price"),
+            original_cents=parse_amount(data.get("original_price"), currency),
+            original_display=data.get("original_price"),
+            currency=currency,
+            is_prime_eligible=data.get("is_prime_eligible", False),
+            promotions=data.get("promotions"),
+            image_url=data.get("image_url"),
+            product_url=data.get("product_url"),
+        )
+
+        savings = data.get("savings")
+        if savings:
+            prefix, _, amount = str(savings).rpartition(" ")
+            product.savings_currency = sys.intern(prefix) if prefix else None
+            product.savings_cents = parse_amount(amount, currency)
+        product.savings_pct = parse_percentage(data.get("savings_percentage"))
+
+        # Keep display strings the numbers can't reproduce exactly
+        raw = {}
+        for field in ("savings", "savings_percentage"):
+            if data.get(field) != product._format(field):
+                raw[field] = data.get(field)
+        if "promotions" in data and data["promotions"] is None:
+            raw["promotions"] = None
+        product._raw = raw or None
+
+        extra = {key: value for key, value in data.items() if key not in JSON_FIELDS}
+        product._extra = extra or None
+        return product
+
+    def _format(self, field):
+        if field == "savings":
+            if self.savings_cents is None:
+                return None
+            # The fetcher always prints savings with two decimals
+            amount = f"{self.savings_cents / 10 ** minor_unit_digits(self.currency):.2f}"
+            return f"{self.savings_currency} {amount}" if self.savings_currency else amount
+        if field == "savings_percentage":
+            return None if self.savings_pct is None else f"{self.savings_pct:.0f}%"
+        raise KeyError(field)
+
+    def to_dict(self):
+        """Convert back to a products.json product dictionary."""
+        data = {
+            "asin": self.asin,
+            "title": self.title,
+            "current_price": self.price_display,
+            "original_price": self.original_display,
+            "savings": self._format("savings"),
+            "savings_percentage": self._format("savings_percentage"),
+            "currency": self.currency,
+            "is_prime_eligible": self.is_prime_eligible,
+            "promotions": self.promotions,
+            "image_url": self.image_url,
+            "product_url": self.product_url,
+        }
+        if self._raw:
+            data.update(self._raw)
+        if self._extra:
+            data.update(self._extra)
+        return data
+
+    def __repr__(self):
+        return f"Product({self.asin!r}, {self.title!r}, price_cents={self.price_cents})"
+
+    def __eq__(self, other):
+        if not isinstance(other, Product):
+            return NotImplemented
+        return self.to_dict() == other.to_dict()
+
+    __hash__ = None
+
+
+def from_json_products(products):
+    """Convert a list of products.json dictionaries to Product objects."""
+    return [Product.from_dict(p) for p in products]
+
+
+def to_json_products(products):
+    """Convert a list of Product objects to products.json dictionaries."""
+    return [p.to_dict() for p in products]
@@ -0,0 +1,315 @@
+"""
+Product Store
+SQLite-backed product catalog with price history. The fetcher upserts
+every run into it and products.json is exported from it.
+"""
+
+import json
+import sqlite3
+from datetime import datetime, timedelta
+
+import config
+from product_model import Product
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    fetched_at TEXT NOT NULL,
+    product_count INTEGER NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS products (
+    asin TEXT PRIMARY KEY,
+    title TEXT,
+    current_price TEXT,
+    original_price TEXT,
+    savings TEXT,
+    savings_percentage TEXT,
+    currency TEXT,
+    is_prime_eligible INTEGER NOT NULL DEFAULT 0,
+    promotions TEXT NOT NULL DEFAULT '[]',
+    image_url TEXT,
+    product_url TEXT,
+    first_seen TEXT NOT NULL,
+    last_seen TEXT NOT NULL,
+    last_run INTEGER REFERENCES runs(id),
+    run_position INTEGER
+);
+
+CREATE INDEX IF NOT EXISTS idx_products_last_run ON products (last_run, run_position);
+
+CREATE TABLE IF NOT EXISTS price_observations (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    asin TEXT NOT NULL REFERENCES products(asin),
+    observed_at TEXT NOT NULL,
+    price_cents INTEGER,
+    original_cents INTEGER,
+    savings_percentage REAL,
+    is_prime_eligible INTEGER NOT NULL DEFAULT 0
+);
+
+CREATE INDEX IF NOT EXISTS idx_observations_asin_time ON price_observations (asin, observed_at);
+CREATE INDEX IF NOT EXISTS idx_observations_time ON price_observations (observed_at);
+"""
+
+# Columns of the products table that mirror products.json fields
+PRODUCT_FIELDS = (
+    "asin",
+    "title",
+    "current_price",
+    "original_price",
+    "savings",
+    "savings_percentage",
+    "currency",
+    "is_prime_eligible",
+    "promotions",
+    "image_url",
+    "product_url",
+)
+
+
+def connect(path=None):
+    """
+    Open the product store, creating the schema if needed.
+
+    Args:
+        path: SQLite database file (defaults to config.PRODUCT_DB)
+
+    Returns:
+        sqlite3.Connection: Connection with rows accessible by column name
+    """
+    if path is None:
+        path = config.PRODUCT_DB
+    conn = sqlite3.connect(path)
+    conn.row_factory = sqlite3.Row
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def upsert_products(conn, products, fetched_at=None, batch_size=500):
+    """
+    Record a fetch run: upsert products and append their price observations.
+
+    Everything is written in one transaction, in executemany batches.
+    Products marked "stale" (prices replayed from the response cache or
+    not refreshed) are upserted but get no price observation, so the
+    history only holds prices seen live at their timestamp.
+
+    Args:
+        conn: Connection from connect()
+        products: List of product dictionaries in products.json format
+        fetched_at: ISO timestamp of the fetch (defaults to now)
+        batch_size: Rows per executemany call
+
+    Returns:
+        int: The id of the new run
+    """
+    if fetched_at is None:
+        fetched_at = datetime.now().isoformat()
+
+    with conn:
+        cursor = conn.execute(
+            "INSERT INTO runs (fetched_at, product_count) VALUES (?, ?)",
+            (fetched_at, len(products))
+        )
+        run_id = cursor.lastrowid
+
+        for start in range(0, len(products), batch_size):
+            batch = products[start:start + batch_size]
+            conn.executemany(
+                """
+                INSERT INTO products (
+                    asin, title, current_price, original_price, savings, savings_percentage,
+                    currency, is_prime_eligible, promotions, image_url, product_url,
+                    first_seen, last_seen, last_run, run_position
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(asin) DO UPDATE SET
+                    title = excluded.title,
+                    current_price = excluded.current_price,
+                    original_price = excluded.original_price,
+                    savings = excluded.savings,
+                    savings_percentage = excluded.savings_percentage,
+                    currency = excluded.currency,
+                    is_prime_eligible = excluded.is_prime_eligible,
+                    promotions = excluded.promotions,
+                    image_url = excluded.image_url,
+                    product_url = excluded.product_url,
+                    last_seen = excluded.last_seen,
+                    last_run = excluded.last_run,
+                    run_position = excluded.run_position
+                """,
+                [
+                    (
+                        p["asin"], p.get("title"), p.get("current_price"), p.get("original_price"),
+                        p.get("savings"), p.get("savings_percentage"), p.get("currency"),
+                        int(bool(p.get("is_prime_eligible"))), json.dumps(p.get("promotions") or []),
+                        p.get("image_url"), p.get("product_url"),
+                        fetched_at, fetched_at, run_id, start + i,
+                    )
+                    for i, p in enumerate(batch)
+                ]
+            )
+            live = [p for p in batch if not p.get("stale")]
+            conn.executemany(
+                """
+                INSERT INTO price_observations (
+                    asin, observed_at, price_cents, original_cents, savings_percentage, is_prime_eligible
+                ) VALUES (?, ?, ?, ?, ?, ?)
+                """,
+                [
+                    (
+                        p.asin, fetched_at, p.price_cents, p.original_cents, p.savings_pct,
+                        int(bool(p.is_prime_eligible)),
+                    )
+                    for p in map(Product.from_dict, live)
+                ]
+            )
+
+    return run_id
+
+
+def row_to_product(row):
+    """Convert a products row to a products.json dictionary."""
+    product = {field: row[field] for field in PRODUCT_FIELDS}
+    product["is_prime_eligible"] = bool(product["is_prime_eligible"])
+    product["promotions"] = json.loads(product["promotions"] or "[]")
+    return product
+
+
+def latest_run(conn):
+    """Return the latest run row, or None if nothing was fetched yet."""
+    return conn.execute("SELECT * FROM runs ORDER BY id DESC LIMIT 1").fetchone()
+
+
+def run_products(conn, run_id=None):
+    """
+    Return the products seen in a run, in fetch order.
+
+    Args:
+        conn: Connection from connect()
+        run_id: Run to export (defaults to the latest run)
+
+    Returns:
+        list: Product dictionaries in products.json format
+    """
+    if run_id is None:
+        run = latest_run(conn)
+        if run is None:
+            return []
+        run_id = run["id"]
+    rows = conn.execute(
+        "SELECT * FROM products WHERE last_run = ? ORDER BY run_position",
+        (run_id,)
+    ).fetchall()
+    return [row_to_product(row) for row in rows]
+
+
+def export_json(conn, filename="products.json", run_id=None, asins=None):
+    """
+    Write products.json as a view of a run in the store.
+
+    Args:
+        conn: Connection from connect()
+        filename: Output filename
+        run_id: Run to export (defaults to the latest run)
+        asins: ASINs to export, in this order (defaults to the whole run in fetch order)
+
+    Returns:
+        int: Number of products exported
+    """
+    run = conn.execute("SELECT * FROM runs WHERE id = ?", (run_id,)).fetchone() if run_id else latest_run(conn)
+    products = run_products(conn, run["id"]) if run else []
+    if asins is not None:
+        by_asin = {product["asin"]: product for product in products}
+        products = [by_asin[asin] for asin in asins if asin in by_asin]
+    output = {
+        "fetch_timestamp": run["fetched_at"] if run else datetime.now().isoformat(),
+        "total_deals": len(products),
+        "products": products
+    }
+    with open(filename, 'w', encoding='utf-8') as f:
+        json.dump(output, f, indent=2, ensure_ascii=False)
+    return len(products)
+
+
+def changed_since(conn, since):
+    """
+    Find products whose price changed after a point in time.
+
+    Args:
+        conn: Connection from connect()
+        since: ISO timestamp
+
+    Returns:
+        list: Rows of (asin, title, observed_at, old_cents, new_cents)
+    """
+    return conn.execute(
+        """
+        SELECT o.asin, p.title, o.observed_at, o.previous_cents AS old_cents, o.price_cents AS new_cents
+        FROM (
+            SELECT asin, observed_at, price_cents,
+                   LAG(price_cents) OVER (PARTITION BY asin ORDER BY observed_at) AS previous_cents
+            FROM price_observations
+            WHERE asin IN (SELECT asin FROM price_observations WHERE observed_at > ?)
+        ) AS o
+        JOIN products AS p ON p.asin = o.asin
+        WHERE o.observed_at > ?
+          AND o.previous_cents IS NOT NULL
+          AND o.price_cents IS NOT o.previous_cents
+        ORDER BY o.observed_at
+        """,
+        (since, since)
+    ).fetchall()
+
+
+def product_history(conn, asins, days=30, now=None, batch_size=500):
+    """
+    Look up when products were first seen and their recent lowest price.
+
+    Args:
+        conn: Connection from connect()
+        asins: ASINs to look up
+        days: Window for the lowest price
+        now: Reference time (defaults to now)
+        batch_size: ASINs per query
+
+    Returns:
+        dict: asin -> (first_seen, lowest_cents) for ASINs already in the store
+    """
+    if now is None:
+        now = datetime.now()
+    since = (now - timedelta(days=days)).isoformat()
+    asins = list(asins)
+    history = {}
+    for start in range(0, len(asins), batch_size):
+        batch = asins[start:start + batch_size]
+        rows = conn.execute(
+            f"""
+            SELECT p.asin, p.first_seen, MIN(o.price_cents)
+            FROM products AS p
+            LEFT JOIN price_observations AS o ON o.asin = p.asin AND o.observed_at >= ?
+            WHERE p.asin IN ({", ".join("?" * len(batch))})
+            GROUP BY p.asin
+            """,
+            [since] + batch
+        ).fetchall()
+        for asin, first_seen, lowest_cents in rows:
+            history[asin] = (first_seen, lowest_cents)
+    return history
+
+
+def lowest_price(conn, asin, days=30, now=None):
+    """
+    Return the lowest observed price of a product over the last days.
+
+    Returns:
+        int: Lowest price in cents, or None if there are no observations
+    """
+    if now is None:
+        now = datetime.now()
+    since = (now - timedelta(days=days)).isoformat()
+    row = conn.execute(
+        "SELECT MIN(price_cents) FROM price_observations WHERE asin = ? AND observed_at >= ?",
+        (asin, since)
+    ).fetchone()
+    return row[0]
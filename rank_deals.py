@@ -0,0 +1,155 @@
+"""
+Deal Ranking
+Scores fetched candidates and keeps the best TOP_K for the video and blog.
+Candidates are streamed through a bounded heap with their history looked
+up a batch at a time, so ranking N products takes O(N log K) time and
+memory for K products plus one batch.
+"""
+
+import heapq
+import itertools
+import math
+from datetime import datetime
+
+import config
+import product_store
+from product_model import Product, minor_unit_digits
+
+# Candidates whose history is looked up per query
+HISTORY_BATCH = 500
+
+
+def score_product(product, history=None, now=None, weights=None):
+    """
+    Score one product; higher is better.
+
+    Args:
+        product: Product from product_model
+        history: (first_seen, lowest_cents) from the product store, or None if new
+        now: Reference time for recency (defaults to now)
+        weights: Score weights (defaults to config.RANK_WEIGHTS)
+
+    Returns:
+        float: Weighted sum of the signals, each in 0-1
+    """
+    if weights is None:
+        weights = config.RANK_WEIGHTS
+
+    savings_percent = min(max(product.savings_pct or 0.0, 0.0), 100.0) / 100
+
+    savings_amount = 0.0
+    if product.savings_cents and product.savings_cents > 0:
+        units = product.savings_cents / 10 ** minor_unit_digits(product.currency)
+        savings_amount = min(1.0, math.log1p(units) / math.log1p(config.RANK_SAVINGS_CAP))
+
+    # Products without history are new and their price is trivially the lowest
+    freshness = 1.0
+    recency = 1.0
+    if history is not None:
+        first_seen, lowest_cents = history
+        if lowest_cents and product.price_cents:
+            freshness = min(1.0, lowest_cents / product.price_cents)
+        if first_seen:
+            if now is None:
+                now = datetime.now()
+            age_days = max(0.0, (now - datetime.fromisoformat(first_seen)).total_seconds() / 86400)
+            recency = 0.5 ** (age_days / config.RANK_RECENCY_HALF_LIFE_DAYS)
+
+    return (
+        weights.get("savings_percent", 0) * savings_percent
+        + weights.get("savings_amount", 0) * savings_amount
+        + weights.get("prime", 0) * (1.0 if product.is_prime_eligible else 0.0)
+        + weights.get("freshness", 0) * freshness
+        + weights.get("recency", 0) * recency
+    )
+
+
+def top_k(candidates, k, score):
+    """
+    Return the k highest-scoring candidates, best first.
+
+    Only k candidates are held at a time; ties keep the input order.
+
+    Args:
+        candidates: Iterable of candidates
+        k: Number to keep
+        score: Function mapping a candidate to its score
+
+    Returns:
+        list: (score, candidate) pairs, best first
+    """
+    if k <= 0:
+        return []
+    heap = []
+    for index, candidate in enumerate(candidates):
+        # The index breaks ties, so candidates themselves are never compared
+        entry = (score(candidate), -index, candidate)
+        if len(heap) < k:
+            heapq.heappush(heap, entry)
+        elif entry > heap[0]:
+            heapq.heapreplace(heap, entry)
+    return [(s, candidate) for s, _, candidate in sorted(heap, reverse=True)]
+
+
+def with_history(products, conn, now, batch_size=HISTORY_BATCH):
+    """
+    Pair candidates with their store history, looking it up a batch at a time.
+
+    Args:
+        products: Iterable of product dictionaries
+        conn: Connection from product_store.connect()
+        now: Reference time for the history window
+        batch_size: Candidates per history query
+
+    Yields:
+        tuple: (product, (first_seen, lowest_cents) or None if new)
+    """
+    products = iter(products)
+    while True:
+        batch = list(itertools.islice(products, batch_size))
+        if not batch:
+            return
+        history = product_store.product_history(
+            conn, (p["asin"] for p in batch), days=config.RANK_HISTORY_DAYS, now=now, batch_size=batch_size
+        )
+        for product in batch:
+            yield product, history.get(product["asin"])
+
+
+def rank_products(products, k=None, conn=None, now=None):
+    """
+    Pick the best k deals from products.json dictionaries.
+
+    Args:
+        products: Iterable of candidate product dictionaries (read once)
+        k: Number of deals to keep (defaults to config.TOP_K)
+        conn: Product store connection for freshness and recency (opened if None)
+        now: Reference time (defaults to now)
+
+    Returns:
+        list: The top k product dictionaries, best first, in the same schema
+    """
+    if k is None:
+        k = config.TOP_K
+    if now is None:
+        now = datetime.now()
+
+    count = 0
+
+    def score(candidate):
+        nonlocal count
+        count += 1
+        product, history = candidate
+        return score_product(Product.from_dict(product), history, now)
+
+    own_conn = conn is None
+    if own_conn:
+        conn = product_store.connect()
+    try:
+        ranked = top_k(with_history(products, conn, now), k, score)
+    finally:
+        if own_conn:
+            conn.close()
+
+    print(f"Ranked {count} candidates, keeping the top {len(ranked)}")
+    return [product for _, (product, _) in ranked]
@@ -0,0 +1,99 @@
+"""
+Raster Cache
+Keeps RGBA layer rasters in a bounded in-memory LRU and as .npy files on
+disk, so text and cover layers are rendered once and reused across slides
+and runs
+"""
+
+import os
+from collections import OrderedDict
+
+import numpy as np
+
+import video_config
+import cache_eviction
+
+
+class RasterCache:
+    """
+    Two-level cache of rasters keyed by a content hash.
+
+    The memory level is an LRU of at most memory_size rasters, so memory
+    stays flat however many products a run has; evicted rasters reload
+    from disk. The disk level is trimmed by evict(), least recently used
+    first.
+    """
+
+    def __init__(self, label, dir_setting, max_bytes_setting, memory_size=32):
+        """
+        Args:
+            label: Name used in warnings (e.g. "text")
+            dir_setting: video_config setting naming the cache directory
+            max_bytes_setting: video_config setting with the disk budget
+            memory_size: Rasters kept in memory
+        """
+        self.label = label
+        self.dir_setting = dir_setting
+        self.max_bytes_setting = max_bytes_setting
+        self.memory_size = memory_size
+        self.rasters = OrderedDict()
+
+    def cache_dir(self, cache_dir=None):
+        """Return the disk cache directory (read from video_config when None)."""
+        if cache_dir is None:
+            cache_dir = getattr(video_config, self.dir_setting)
+        return cache_dir
+
+    def get(self, key, render, cache_dir=None):
+        """
+        Return the raster for a key, calling render() only on a miss.
+
+        Args:
+            key: Hex digest identifying the raster
+            render: Function returning the RGBA uint8 raster
+            cache_dir: Directory for persisted rasters (None for the configured one,
+                an empty string to keep them in memory only)
+
+        Returns:
+            numpy.ndarray: Read-only RGBA uint8 array
+        """
+        raster = self.rasters.get(key)
+        if raster is not None:
+            self.rasters.move_to_end(key)
+            return raster
+
+        cache_dir = self.cache_dir(cache_dir)
+        path = os.path.join(cache_dir, key[:2], key + ".npy") if cache_dir else None
+
+        if path and os.path.exists(path):
+            try:
+                raster = np.load(path)
+                # A hit refreshes the modification time, which eviction orders by
+                os.utime(path)
+            except (OSError, ValueError) as e:
+                print(f"    Warning: Ignoring unreadable {self.label} cache entry {path}: {e}")
+
+        if raster is None:
+            raster = render()
+            if path:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                tmp_path = f"{path}.{os.getpid()}.tmp.npy"
+                np.save(tmp_path, raster)
+                os.replace(tmp_path, path)
+
+        raster.setflags(write=False)
+        self.rasters[key] = raster
+        if len(self.rasters) > self.memory_size:
+            self.rasters.popitem(last=False)
+        return raster
+
+    def evict(self, max_bytes=None, cache_dir=None):
+        """
+        Remove least recently used rasters until the disk cache fits in max_bytes.
+
+        Returns:
+            int: Number of rasters removed
+        """
+        if max_bytes is None:
+            max_bytes = getattr(video_config, self.max_bytes_setting)
+        return cache_eviction.evict_lru(self.cache_dir(cache_dir), max_bytes)[0]
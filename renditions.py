@@ -0,0 +1,59 @@
+"""
+Video Renditions
+Named output variants of the video (landscape, Shorts, square). Each
+rendition is a set of video_config overrides applied while its slides
+are laid out and encoded; the layout scales with the resolution.
+"""
+
+import os
+from contextlib import contextmanager
+
+import video_config
+
+
+def rendition_names(names=None):
+    """Return the renditions to render (defaults to video_config.OUTPUT_RENDITIONS)."""
+    if names is None:
+        names = video_config.OUTPUT_RENDITIONS
+    unknown = [name for name in names if name not in video_config.RENDITIONS]
+    if unknown:
+        raise ValueError(
+            f"Unknown rendition(s) {', '.join(unknown)}; "
+            f"expected one of {', '.join(video_config.RENDITIONS)}"
+        )
+    return list(names)
+
+
+def rendition_settings(name):
+    """Return the video_config overrides of a rendition."""
+    return dict(video_config.RENDITIONS[name])
+
+
+def output_filename(name, output_file):
+    """
+    Return the output file of a rendition.
+
+    The first configured rendition writes output_file itself; the others
+    add their name to it (amazon_deals_video_shorts.mp4).
+    """
+    if name == next(iter(video_config.RENDITIONS)):
+        return output_file
+    stem, extension = os.path.splitext(output_file)
+    return f"{stem}_{name}{extension}"
+
+
+@contextmanager
+def applied(settings):
+    """Temporarily apply video_config overrides (restored on exit)."""
+    missing = object()
+    previous = {name: getattr(video_config, name, missing) for name in settings}
+    for name, value in settings.items():
+        setattr(video_config, name, value)
+    try:
+        yield
+    finally:
+        for name, value in previous.items():
+            if value is missing:
+                delattr(video_config, name)
+            else:
+                setattr(video_config, name, value)
@@ -0,0 +1,290 @@
+"""
+PA API Request Scheduler
+Paces Product Advertising API calls through a shared token bucket sized
+to the account's TPS/TPD quota, serves waiting calls in priority order and
+backs off adaptively when the API answers TooManyRequests
+"""
+
+import heapq
+import itertools
+import json
+import os
+import random
+import threading
+import time
+from datetime import date, datetime, timezone
+
+import config
+
+# Lower numbers go first: re-pricing known ASINs beats speculative searches
+PRIORITY_REPRICE = 0
+PRIORITY_SEARCH = 10
+
+
+# Seconds between checks of a waiting call's cancel event
+CANCEL_POLL = 0.05
+
+
+class QuotaExhausted(Exception):
+    """Raised when the daily request quota (TPD) has been used up."""
+
+
+class RequestCancelled(Exception):
+    """Raised when a call's cancel event is set before the call was sent."""
+
+
+# Error codes PA API uses for throttled requests (HTTP 429)
+THROTTLE_CODES = {"429", "TooManyRequests", "TooManyRequestsException"}
+
+
+def error_codes(error):
+    """
+    Collect the codes an API error carries.
+
+    That is the exception's status (an HTTP status or PA API error code)
+    and, when the reason is a PA API error body, its __type and the Code
+    of every entry in Errors.
+    """
+    codes = {str(getattr(error, 'status', ''))}
+    body = getattr(error, 'reason', None)
+    if isinstance(body, bytes):
+        body = body.decode('utf-8', 'replace')
+    if isinstance(body, str):
+        try:
+            body = json.loads(body)
+        except ValueError:
+            body = None
+    if isinstance(body, dict):
+        codes.add(str(body.get("__type", "")).rsplit("#", 1)[-1])
+        for entry in body.get("Errors") or []:
+            if isinstance(entry, dict):
+                codes.add(str(entry.get("Code", "")))
+    return codes
+
+
+def is_throttled(error):
+    """Return True if an API error means the request was throttled."""
+    return bool(error_codes(error) & THROTTLE_CODES)
+
+
+class TokenBucket:
+    """
+    Token bucket with an adjustable refill rate and an optional daily cap.
+
+    The daily count is saved to usage_file (if given) after every request
+    and loaded from it on start, so the cap covers every run of the day.
+
+    Not thread-safe on its own; RequestScheduler guards it with a lock.
+    """
+
+    def __init__(self, rate, capacity, daily_limit=None, clock=time.monotonic, usage_file=None):
+        self.rate = rate
+        self.capacity = capacity
+        self.daily_limit = daily_limit
+        self.clock = clock
+        self.tokens = capacity
+        self.updated = clock()
+        self.usage_file = usage_file
+        self.day, self.used_today = self._load_usage()
+
+    def _load_usage(self):
+        """Return (day, requests used that day) from the usage file."""
+        if not self.usage_file:
+            return None, 0
+        try:
+            with open(self.usage_file, 'r', encoding='utf-8') as f:
+                usage = json.load(f)
+            return date.fromisoformat(usage["day"]), int(usage["used"])
+        except FileNotFoundError:
+            return None, 0
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            print(f"Warning: Ignoring unreadable PA API usage file {self.usage_file}: {e}")
+            return None, 0
+
+    def _save_usage(self):
+        """Write the daily count to the usage file atomically."""
+        if not self.usage_file:
+            return
+        directory = os.path.dirname(self.usage_file)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.usage_file}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({"day": self.day.isoformat(), "used": self.used_today}, f)
+        os.replace(tmp_path, self.usage_file)
+
+    def _refill(self):
+        now = self.clock()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def try_take(self):
+        """
+        Take a token if one is available.
+
+        Returns:
+            float: 0 if a token was taken, otherwise seconds until the next one
+
+        Raises:
+            QuotaExhausted: If the daily limit has been reached
+        """
+        today = datetime.now(timezone.utc).date()
+        if today != self.day:
+            self.day, self.used_today = today, 0
+        if self.daily_limit is not None and self.used_today >= self.daily_limit:
+            raise QuotaExhausted(f"Daily PA API quota of {self.daily_limit} requests used up")
+
+        self._refill()
+        if self.tokens >= 1:
+            self.tokens -= 1
+            self.used_today += 1
+            self._save_usage()
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+    def set_rate(self, rate):
+        """Change the refill rate, keeping the tokens accumulated so far."""
+        self._refill()
+        self.rate = rate
+
+
+class RequestScheduler:
+    """
+    Shared gate every PA API call goes through.
+
+    Callers block in call() until the bucket has a token for them; when
+    several are waiting the lowest priority number goes first. Throttled
+    calls are retried with exponential backoff and halve the request
+    rate, which then creeps back up to the configured TPS on success.
+    """
+
+    def __init__(self, tps=None, burst=None, tpd=None, max_retries=None,
+                 backoff_base=None, backoff_max=None, clock=time.monotonic, sleep=None,
+                 usage_file=None):
+        self.max_rate = tps if tps is not None else config.API_TPS
+        self.min_rate = self.max_rate / 16
+        self.max_retries = max_retries if max_retries is not None else config.API_MAX_RETRIES
+        self.backoff_base = backoff_base if backoff_base is not None else config.API_BACKOFF_BASE
+        self.backoff_max = backoff_max if backoff_max is not None else config.API_BACKOFF_MAX
+        self.clock = clock
+        self.bucket = TokenBucket(
+            self.max_rate,
+            burst if burst is not None else config.API_BURST,
+            tpd if tpd is not None else config.API_TPD,
+            clock,
+            usage_file if usage_file is not None else config.API_USAGE_FILE,
+        )
+        self.paused_until = 0.0
+        self.condition = threading.Condition()
+        self.waiting = []
+        self.sequence = itertools.count()
+        self.stats = {"calls": 0, "throttled": 0, "retries": 0}
+
+    def _acquire(self, priority, cancel=None):
+        entry = (priority, next(self.sequence))
+        with self.condition:
+            heapq.heappush(self.waiting, entry)
+            try:
+                while True:
+                    if cancel is not None and cancel.is_set():
+                        raise RequestCancelled("Request cancelled before it was sent")
+                    if self.waiting[0] == entry:
+                        wait = self.paused_until - self.clock()
+                        if wait <= 0:
+                            wait = self.bucket.try_take()
+                        if wait <= 0:
+                            return
+                    else:
+                        wait = None
+                    if cancel is not None:
+                        wait = CANCEL_POLL if wait is None else min(wait, CANCEL_POLL)
+                    self.condition.wait(timeout=wait)
+            finally:
+                self.waiting.remove(entry)
+                heapq.heapify(self.waiting)
+                self.condition.notify_all()
+
+    def _on_success(self):
+        with self.condition:
+            if self.bucket.rate < self.max_rate:
+                self.bucket.set_rate(min(self.max_rate, self.bucket.rate + self.max_rate / 8))
+
+    def _on_throttled(self, attempt):
+        delay = min(self.backoff_max, self.backoff_base * (2 ** attempt))
+        delay *= random.uniform(0.5, 1.0)
+        with self.condition:
+            self.stats["throttled"] += 1
+            self.bucket.set_rate(max(self.min_rate, self.bucket.rate / 2))
+            self.paused_until = max(self.paused_until, self.clock() + delay)
+            self.condition.notify_all()
+
+    def call(self, func, *args, priority=PRIORITY_SEARCH, cancel=None, **kwargs):
+        """
+        Run an API call once the rate limit allows it.
+
+        Args:
+            func: API method to call
+            priority: Lower values are served first
+            cancel: Optional threading.Event; setting it while the call is
+                waiting for its turn drops the call
+            *args, **kwargs: Passed through to func
+
+        Returns:
+            The result of func
+
+        Raises:
+            QuotaExhausted: If the daily quota is used up
+            RequestCancelled: If cancel was set before the call was sent
+            Exception: The API error if it isn't throttling or retries ran out
+        """
+        for attempt in range(self.max_retries + 1):
+            self._acquire(priority, cancel)
+            with self.condition:
+                self.stats["calls"] += 1
+            try:
+                result = func(*args, **kwargs)
+            except Exception as e:
+                if not is_throttled(e) or attempt == self.max_retries:
+                    raise
+                self._on_throttled(attempt)
+                with self.condition:
+                    self.stats["retries"] += 1
+                continue
+            self._on_success()
+            return result
+
+
+class ScheduledAPIClient:
+    """
+    PA API client wrapper that sends every request through a RequestScheduler.
+
+    search_items and get_items accept extra priority and cancel keywords
+    (see RequestScheduler.call); other attributes are passed through to
+    the wrapped client.
+    """
+
+    def __init__(self, client, scheduler):
+        self.client = client
+        self.scheduler = scheduler
+
+    def search_items(self, priority=PRIORITY_SEARCH, cancel=None, **kwargs):
+        return self.scheduler.call(self.client.search_items, priority=priority, cancel=cancel, **kwargs)
+
+    def get_items(self, priority=PRIORITY_REPRICE, cancel=None, **kwargs):
+        return self.scheduler.call(self.client.get_items, priority=priority, cancel=cancel, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self.client, name)
+
+
+_shared_scheduler = None
+_shared_lock = threading.Lock()
+
+
+def get_scheduler():
+    """Return the process-wide scheduler, creating it on first use."""
+    global _shared_scheduler
+    with _shared_lock:
+        if _shared_scheduler is None:
+            _shared_scheduler = RequestScheduler()
+        return _shared_scheduler
@@ -0,0 +1,190 @@
+"""
+PA API Response Cache
+On-disk cache of PA API responses keyed by operation, request parameters,
+resources and marketplace, with per-operation TTLs, size-bounded eviction
+and an offline mode that replays cached responses without calling Amazon
+"""
+
+import hashlib
+import json
+import os
+import pickle
+import threading
+import time
+
+import config
+import cache_eviction
+
+# Eviction trims the cache to this fraction of max_bytes, so the next walk
+# of the directory is only needed after that much has been written again
+EVICT_TO = 0.9
+
+# Request arguments that don't change the response
+IGNORED_ARGS = {"priority", "cancel", "http_info", "async_req"}
+
+
+class OfflineCacheMiss(Exception):
+    """Raised in offline mode when a request has no cached response."""
+
+
+def request_key(operation, kwargs):
+    """
+    Build the cache key for a request.
+
+    Args:
+        operation: API method name, e.g. "search_items"
+        kwargs: Request keyword arguments
+
+    Returns:
+        str: Hex digest identifying the request
+    """
+    params = {}
+    for name, value in kwargs.items():
+        if name in IGNORED_ARGS:
+            continue
+        if name == "item_ids":
+            # The same ASINs in any order are the same request
+            value = sorted(value)
+        elif isinstance(value, (list, tuple)):
+            value = [str(v) for v in value]
+        params[name] = value
+    payload = {
+        "operation": operation,
+        "params": params,
+        "marketplace": config.MARKETPLACE,
+        # Keep responses from the local fake API apart from real ones
+        "source": "fake" if config.USE_FAKE_API else "paapi",
+    }
+    data = json.dumps(payload, sort_keys=True, default=str).encode('utf-8')
+    return hashlib.sha256(data).hexdigest()
+
+
+class ResponseCache:
+    """Pickled responses stored one file per request key."""
+
+    def __init__(self, cache_dir=None, ttl=None, max_bytes=None):
+        self.cache_dir = cache_dir if cache_dir is not None else config.API_CACHE_DIR
+        self.ttl = ttl if ttl is not None else config.API_CACHE_TTL
+        self.max_bytes = max_bytes if max_bytes is not None else config.API_CACHE_MAX_BYTES
+        self.hits = 0
+        self.misses = 0
+        # Bytes on disk, counted by the first evict() and kept up to date
+        # by put(), so the directory is only walked when it is over budget
+        self.total_bytes = None
+        self.lock = threading.Lock()
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, key[:2], key + ".pkl")
+
+    def get(self, operation, key, ignore_ttl=False):
+        """
+        Return the cached response, or None if missing or expired.
+
+        A hit refreshes the file's modification time for LRU eviction.
+        """
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as f:
+                stored_at, response = pickle.load(f)
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        except (OSError, EOFError, pickle.UnpicklingError) as e:
+            print(f"Warning: Ignoring unreadable cache entry {path}: {e}")
+            self.misses += 1
+            return None
+
+        if not ignore_ttl and time.time() - stored_at > self.ttl.get(operation, 0):
+            self.misses += 1
+            return None
+        os.utime(path)
+        self.hits += 1
+        return response
+
+    def put(self, key, response):
+        """Store a response and evict old entries if the cache is too big."""
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            pickle.dump((time.time(), response), f)
+        size = os.path.getsize(tmp_path)
+        try:
+            replaced = os.path.getsize(path)
+        except OSError:
+            replaced = 0
+        os.replace(tmp_path, path)
+
+        with self.lock:
+            if self.total_bytes is not None:
+                self.total_bytes += size - replaced
+            over_budget = self.total_bytes is None or self.total_bytes > self.max_bytes
+        if over_budget:
+            self.evict()
+
+    def evict(self):
+        """Remove least recently used entries until the cache fits in EVICT_TO * max_bytes."""
+        with self.lock:
+            self._evict()
+
+    def _evict(self):
+        _, self.total_bytes = cache_eviction.evict_lru(
+            self.cache_dir, self.max_bytes, self.max_bytes * EVICT_TO
+        )
+
+
+_shared_cache = None
+_shared_lock = threading.Lock()
+
+
+def get_cache():
+    """
+    Return the process-wide response cache, creating it on first use.
+
+    Clients share it so the byte count behind eviction covers every write.
+    """
+    global _shared_cache
+    with _shared_lock:
+        if _shared_cache is None:
+            _shared_cache = ResponseCache()
+        return _shared_cache
+
+
+class CachedAPIClient:
+    """
+    PA API client wrapper that answers repeated requests from the cache.
+
+    In offline mode every request is served from the cache regardless of
+    age, and a miss raises OfflineCacheMiss instead of calling the API.
+    """
+
+    def __init__(self, client, cache=None, offline=None):
+        self.client = client
+        self.cache = cache if cache is not None else get_cache()
+        self.offline = offline if offline is not None else config.API_OFFLINE
+        self._local = threading.local()
+
+    def served_from_cache(self):
+        """Return True if the calling thread's last request was answered from the cache."""
+        return getattr(self._local, "hit", False)
+
+    def _call(self, operation, kwargs):
+        key = request_key(operation, kwargs)
+        response = self.cache.get(operation, key, ignore_ttl=self.offline)
+        self._local.hit = response is not None
+        if response is not None:
+            return response
+        if self.offline:
+            raise OfflineCacheMiss(f"No cached response for {operation} {kwargs}")
+        response = getattr(self.client, operation)(**kwargs)
+        self.cache.put(key, response)
+        return response
+
+    def search_items(self, **kwargs):
+        return self._call("search_items", kwargs)
+
+    def get_items(self, **kwargs):
+        return self._call("get_items", kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self.client, name)
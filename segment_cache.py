@@ -0,0 +1,146 @@
+"""
+Segment Cache
+On-disk cache of encoded slide segments keyed by a hash of the slide
+content and the video settings, so reruns only re-encode changed slides
+"""
+
+import hashlib
+import json
+import os
+import shutil
+
+import video_config
+import cover_art
+import cache_eviction
+
+# Bump when the slide drawing code changes in a way the key can't see
+CACHE_VERSION = 1
+
+# Product fields that appear on a slide
+PRODUCT_FIELDS = ("title", "savings", "savings_percentage", "is_prime_eligible", "image_url")
+
+# video_config settings that don't change how a segment looks or is encoded
+IGNORED_SETTINGS = {
+    "OUTPUT_FILENAME",
+    "AUDIO",
+    "AUDIO_FILENAME",
+    "AUDIO_BITRATE",
+    "AUDIO_CACHE_DIR",
+    "AUDIO_CACHE_MAX_BYTES",
+    "RENDER_MODE",
+    "RENDER_WORKERS",
+    "SEGMENT_CACHE",
+    "SEGMENT_CACHE_DIR",
+    "SEGMENT_CACHE_MAX_BYTES",
+    "TEXT_CACHE_DIR",
+    "TEXT_CACHE_MAX_BYTES",
+    "COVER_CACHE_DIR",
+    "COVER_CACHE_MAX_BYTES",
+    "RENDITIONS",
+    "OUTPUT_RENDITIONS",
+    "PREVIEW_SLIDES",
+    "PREVIEW_SCALE",
+    "PREVIEW_FPS",
+    "PREVIEW_ENCODER_PROFILE",
+    "PREVIEW_COLUMNS",
+    "PREVIEW_FILENAME",
+    "PREVIEW_CLIP_FILENAME",
+    "THUMBNAIL_FILENAME",
+    "THUMBNAIL_QUALITY",
+}
+
+
+def config_fingerprint():
+    """Return the video_config settings that affect segment output."""
+    return {
+        name: getattr(video_config, name)
+        for name in sorted(dir(video_config))
+        if name.isupper() and name not in IGNORED_SETTINGS
+    }
+
+
+def segment_key(kind, product=None):
+    """
+    Build the cache key for a slide segment.
+
+    Args:
+        kind: "intro", "product" or "outro"
+        product: Product dictionary (only for "product" slides)
+
+    Returns:
+        str: Hex digest identifying the segment
+    """
+    payload = {
+        "version": CACHE_VERSION,
+        "kind": kind,
+        "product": {field: product.get(field) for field in PRODUCT_FIELDS} if product else None,
+        # Image files are content-addressed, so this changes when the cover does
+        "cover": os.path.basename(cover_art.cover_file(product) or "") if product else None,
+        "config": config_fingerprint(),
+    }
+    data = json.dumps(payload, sort_keys=True, default=str).encode('utf-8')
+    return hashlib.sha256(data).hexdigest()
+
+
+def transition_key(from_key, to_key):
+    """
+    Build the cache key for the transition between two slide segments.
+
+    The slide keys already cover the slides' content and the transition
+    settings.
+    """
+    payload = {"version": CACHE_VERSION, "transition": [from_key, to_key]}
+    return hashlib.sha256(json.dumps(payload).encode('utf-8')).hexdigest()
+
+
+def cache_path(key, cache_dir=None, extension=".mp4"):
+    """Return the path a segment (or, with extension=".npy", its frame) is stored at."""
+    if cache_dir is None:
+        cache_dir = video_config.SEGMENT_CACHE_DIR
+    return os.path.join(cache_dir, key[:2], key + extension)
+
+
+def lookup(key, cache_dir=None, extension=".mp4"):
+    """
+    Find a cached segment (or slide frame).
+
+    A hit refreshes the file's modification time, which is what the
+    LRU eviction orders by.
+
+    Returns:
+        str: Path of the cached file, or None on a miss
+    """
+    path = cache_path(key, cache_dir, extension)
+    if not os.path.exists(path):
+        return None
+    os.utime(path)
+    return path
+
+
+def store(key, segment_file, cache_dir=None, extension=".mp4"):
+    """
+    Copy an encoded segment (or slide frame) into the cache.
+
+    Returns:
+        str: Path of the cached file
+    """
+    path = cache_path(key, cache_dir, extension)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    shutil.copyfile(segment_file, tmp_path)
+    os.replace(tmp_path, path)
+    return path
+
+
+def evict(max_bytes=None, cache_dir=None):
+    """
+    Remove least recently used segments until the cache fits in max_bytes.
+
+    Returns:
+        int: Number of segments removed
+    """
+    if max_bytes is None:
+        max_bytes = video_config.SEGMENT_CACHE_MAX_BYTES
+    if cache_dir is None:
+        cache_dir = video_config.SEGMENT_CACHE_DIR
+    return cache_eviction.evict_lru(cache_dir, max_bytes)[0]
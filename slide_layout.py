@@ -0,0 +1,280 @@
+"""
+Slide Layout
+Describes the text and image layers of every slide type, so the MoviePy
+renderer and the NumPy compositor draw exactly the same layout. Positions
+are fractions of the screen and pixel sizes scale with the resolution, so
+one description serves every rendition.
+"""
+
+import video_config
+import text_cache
+import cover_art
+
+
+def text_layer(name, position, shared=False, **text):
+    """
+    Describe one text layer.
+
+    Args:
+        name: Layer name used in warnings
+        position: (x, y) of the layer's top-left corner; x may be 'center'
+        shared: True if the layer doesn't depend on the product, so it
+            appears on many slides
+        **text: Keyword arguments for text_cache.render_text
+
+    Returns:
+        dict: Layer description
+    """
+    return {"name": name, "position": position, "shared": shared, "text": text}
+
+
+def image_layer(name, position, **image):
+    """
+    Describe one image layer.
+
+    Args:
+        name: Layer name used in warnings
+        position: (x, y) of the layer's top-left corner
+        **image: Keyword arguments for cover_art.render_cover
+
+    Returns:
+        dict: Layer description
+    """
+    return {"name": name, "position": position, "shared": False, "image": image}
+
+
+def layer_key(layer):
+    """Return the raster cache key of a text or image layer."""
+    if "image" in layer:
+        return cover_art.cover_key(layer["image"]["source"], layer["image"]["box"])
+    return text_cache.render_key(**layer["text"])
+
+
+def render_layer(layer):
+    """Return the RGBA raster of a text or image layer."""
+    if "image" in layer:
+        return cover_art.render_cover(**layer["image"])
+    return text_cache.render_text(**layer["text"])
+
+
+def layout_scale(width, height):
+    """Return the factor pixel sizes of the layout are scaled by at a resolution."""
+    return min(width / video_config.LAYOUT_BASE_WIDTH, height / video_config.LAYOUT_BASE_HEIGHT)
+
+
+def scaled(value, scale):
+    """Scale a layout size in pixels."""
+    return int(round(value * scale))
+
+
+def cover_box(width, height):
+    """Return the (x, y, width, height) box of the cover image on a product slide."""
+    return (
+        int(width * video_config.COVER_X_POS),
+        int(height * video_config.COVER_Y_POS),
+        int(width * video_config.COVER_WIDTH),
+        int(height * video_config.COVER_HEIGHT),
+    )
+
+
+def product_layers(product, width, height):
+    """Return the layers of a product slide."""
+    layers = []
+    scale = layout_scale(width, height)
+    margin = scaled(50, scale)
+
+    # Cover image; placed on the left, title and savings move into the space right of it
+    text_x, text_width = 'center', width - 2 * margin
+    cover = cover_art.cover_file(product)
+    if cover:
+        x, y, box_width, box_height = cover_box(width, height)
+        layers.append(image_layer("cover", (x, y), source=cover, box=(box_width, box_height)))
+        if video_config.COVER_PLACEMENT == "left":
+            text_x = x + box_width + margin
+            text_width = width - text_x - margin
+
+    # Title
+    title_text = product['title']
+    # Truncate if too long
+    if len(title_text) > 60:
+        title_text = title_text[:57] + "..."
+    # Add spaces to help with bounding box
+    title_text = title_text + "   "
+
+    layers.append(text_layer(
+        "title",
+        (text_x, int(height * video_config.TITLE_Y_POS)),
+        text=title_text,
+        font_size=scaled(video_config.TITLE_FONT_SIZE, scale),
+        color='white',
+        size=(text_width, scaled(300, scale)),
+        method='caption',
+        text_align='center'
+    ))
+
+    # Current Price and Original Price (Removed)
+    # layers.append(text_layer(
+    #     "price",
+    #     ('center', int(height * video_config.CURRENT_PRICE_Y_POS)),
+    #     text=product['current_price'] + " ",  # Add space to prevent clipping
+    #     font_size=video_config.CURRENT_PRICE_FONT_SIZE,
+    #     color='#22C55E',  # Green
+    #     text_align='center'
+    # ))
+    # if product.get('original_price'):
+    #     layers.append(text_layer(
+    #         "original price",
+    #         ('center', int(height * video_config.ORIGINAL_PRICE_Y_POS)),
+    #         text=f"Was: {product['original_price']}",
+    #         font_size=video_config.ORIGINAL_PRICE_FONT_SIZE,
+    #         color='#94A3B8',  # Gray
+    #         text_align='center'
+    #     ))
+
+    # Savings Information
+    if product.get('savings') and product.get('savings_percentage'):
+        layers.append(text_layer(
+            "savings",
+            (text_x, int(height * video_config.SAVINGS_Y_POS)),
+            text=f"Save {product['savings']} ({product['savings_percentage']})",
+            font_size=scaled(video_config.SAVINGS_FONT_SIZE, scale),
+            color='#FBBF24',  # Amber/Gold
+            size=(text_width, scaled(100, scale)),
+            method='caption',
+            text_align='center'
+        ))
+
+    # Savings Percentage Badge (Top)
+    if product.get('savings_percentage'):
+        layers.append(text_layer(
+            "badge",
+            ('center', int(height * video_config.BADGE_Y_POS)),
+            text=f"{product['savings_percentage']} OFF",
+            font_size=scaled(video_config.BADGE_FONT_SIZE, scale),
+            color='white',
+            bg_color='#DC2626',  # Red background
+            size=(scaled(400, scale), scaled(120, scale)),
+            method='caption',
+            text_align='center'
+        ))
+
+    # Prime Badge if eligible
+    if product.get('is_prime_eligible'):
+        layers.append(text_layer(
+            "prime",
+            (width - scaled(300, scale), height - scaled(100, scale)),
+            shared=True,
+            text="Prime Eligible",
+            font_size=scaled(35, scale),
+            color='white',
+            bg_color='#0F9D58',  # Green
+            size=(scaled(250, scale), scaled(60, scale)),
+            method='caption'
+        ))
+
+    # Link in Description Text
+    layers.append(text_layer(
+        "link text",
+        ('center', int(height * video_config.LINK_TEXT_Y_POS)),
+        shared=True,
+        text="Product Link in Description",
+        font_size=scaled(video_config.LINK_TEXT_FONT_SIZE, scale),
+        color='white',
+        size=(width - 2 * margin, scaled(100, scale)),
+        method='caption',
+        text_align='center'
+    ))
+
+    return layers
+
+
+def intro_layers(width, height):
+    """Return the text layers of the intro slide."""
+    scale = layout_scale(width, height)
+    return [
+        text_layer(
+            "intro title",
+            ('center', int(height * 0.30)),
+            shared=True,
+            text="Amazon Deals",
+            font_size=scaled(120, scale),
+            color='white',
+            size=(width - scaled(100, scale), scaled(300, scale)),
+            method='caption'
+        ),
+        text_layer(
+            "intro subtitle",
+            ('center', int(height * 0.75)),
+            shared=True,
+            text="Today's Best Offers",
+            font_size=scaled(60, scale),
+            color='#FBBF24',
+            size=(width - scaled(100, scale), scaled(150, scale)),
+            method='caption'
+        ),
+    ]
+
+
+def outro_layers(width, height):
+    """Return the text layers of the outro slide."""
+    scale = layout_scale(width, height)
+    return [
+        text_layer(
+            "outro title",
+            ('center', int(height * 0.30)),
+            shared=True,
+            text="Thanks for Watching!",
+            font_size=scaled(100, scale),
+            color='white',
+            size=(width - scaled(100, scale), scaled(300, scale)),
+            method='caption'
+        ),
+        text_layer(
+            "outro subtitle",
+            ('center', int(height * 0.75)),
+            shared=True,
+            text="Check description for links",
+            font_size=scaled(50, scale),
+            color='#FBBF24',
+            size=(width - scaled(100, scale), scaled(150, scale)),
+            method='caption'
+        ),
+    ]
+
+
+def slide_layers(kind, product, width, height):
+    """Return the layers for a slide of the given kind."""
+    if kind == "intro":
+        return intro_layers(width, height)
+    if kind == "outro":
+        return outro_layers(width, height)
+    return product_layers(product, width, height)
+
+
+def slide_duration(kind):
+    """Return how many seconds a slide of the given kind is on screen."""
+    if kind == "intro":
+        return video_config.INTRO_DURATION
+    if kind == "outro":
+        return video_config.OUTRO_DURATION
+    return video_config.SLIDE_DURATION
+
+
+def slide_sequence(deals):
+    """
+    Return every slide of the video in order.
+
+    Args:
+        deals: List of product dictionaries
+
+    Returns:
+        list: (kind, product, duration in seconds) per slide; product is
+            None for the intro and outro
+    """
+    slides = [("intro", None)] + [("product", product) for product in deals] + [("outro", None)]
+    return [(kind, product, slide_duration(kind)) for kind, product in slides]
+
+
+def video_duration(deals):
+    """Return the length of the video in seconds."""
+    return sum(duration for _, _, duration in slide_sequence(deals))
@@ -0,0 +1,109 @@
+"""
+Text Raster Cache
+Rasterizes TextClip layers once and reuses the RGBA pixels across slides
+(in memory) and across runs (on disk)
+"""
+
+import hashlib
+import json
+
+import moviepy
+from moviepy import ImageClip, TextClip
+import numpy as np
+
+import raster_cache
+
+_cache = raster_cache.RasterCache("text", "TEXT_CACHE_DIR", "TEXT_CACHE_MAX_BYTES")
+
+
+def text_key(text, font_size, color, bg_color, size, method, text_align, font):
+    """Return the cache key for a text raster."""
+    payload = [moviepy.__version__, text, font, font_size, color, bg_color,
+               list(size) if size else None, method, text_align]
+    return hashlib.sha256(json.dumps(payload).encode('utf-8')).hexdigest()
+
+
+def render_key(text, font_size, color='black', bg_color=None, size=None,
+               method='label', text_align='left', font=None, cache_dir=None):
+    """Return the cache key render_text uses for the same arguments."""
+    return text_key(text, font_size, color, bg_color, size, method, text_align, font)
+
+
+def rasterize_text(text, font_size, color, bg_color, size, method, text_align, font):
+    """Render text with TextClip and return it as an RGBA uint8 array."""
+    kwargs = dict(
+        text=text,
+        font=font,
+        font_size=font_size,
+        color=color,
+        bg_color=bg_color,
+        method=method,
+        text_align=text_align,
+    )
+    if size:
+        kwargs["size"] = size
+    clip = TextClip(**kwargs)
+    rgb = clip.get_frame(0)
+    if clip.mask is not None:
+        alpha = np.round(clip.mask.get_frame(0) * 255).astype(np.uint8)
+    else:
+        alpha = np.full(rgb.shape[:2], 255, dtype=np.uint8)
+    clip.close()
+    return np.dstack([rgb.astype(np.uint8), alpha])
+
+
+def render_text(text, font_size, color='black', bg_color=None, size=None,
+                method='label', text_align='left', font=None, cache_dir=None):
+    """
+    Return the RGBA raster for a piece of text, rendering it only on a miss.
+
+    Args:
+        text: Text to render
+        font_size: Font size in points
+        color: Text color
+        bg_color: Background color (None for transparent)
+        size: (width, height) box for the text, or None to fit the text
+        method: TextClip method ('label' or 'caption')
+        text_align: Text alignment inside the box
+        font: Font name or path (None for the MoviePy default)
+        cache_dir: Directory for persisted rasters (defaults to video_config.TEXT_CACHE_DIR)
+
+    Returns:
+        numpy.ndarray: Read-only RGBA uint8 array of shape (height, width, 4)
+    """
+    key = text_key(text, font_size, color, bg_color, size, method, text_align, font)
+    return _cache.get(
+        key,
+        lambda: rasterize_text(text, font_size, color, bg_color, size, method, text_align, font),
+        cache_dir,
+    )
+
+
+def evict(max_bytes=None, cache_dir=None):
+    """
+    Remove least recently used rasters until the disk cache fits in max_bytes
+    (defaults to video_config.TEXT_CACHE_MAX_BYTES).
+
+    Returns:
+        int: Number of rasters removed
+    """
+    return _cache.evict(max_bytes, cache_dir)
+
+
+def raster_clip(raster, duration):
+    """Build an ImageClip with mask from an RGBA raster."""
+    mask = ImageClip(raster[:, :, 3] / 255.0, is_mask=True, duration=duration)
+    return ImageClip(raster[:, :, :3], duration=duration).with_mask(mask)
+
+
+def text_clip(duration, **kwargs):
+    """
+    Build an ImageClip with mask from a cached text raster.
+
+    Accepts the same keyword arguments as render_text and can be used in
+    place of TextClip.
+
+    Returns:
+        ImageClip: Clip showing the text for the given duration
+    """
+    return raster_clip(render_text(**kwargs), duration)
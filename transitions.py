@@ -0,0 +1,155 @@
+"""
+Slide Transitions
+Crossfade, slide-in and wipe between two static slide frames. Only the
+short window between slides is rendered frame by frame, with uint8
+fixed-point blending in NumPy; the rest of each slide stays a still
+segment.
+"""
+
+import numpy as np
+
+import video_config
+import video_segments
+
+STYLES = ("none", "crossfade", "slide", "wipe")
+
+# Width of the wipe's soft edge as a fraction of the frame width
+WIPE_EDGE = 0.05
+
+
+def transition_style():
+    """Return the configured transition style, checking it is known."""
+    style = video_config.TRANSITION
+    if style not in STYLES:
+        raise ValueError(f"Unknown transition '{style}'; expected one of {', '.join(STYLES)}")
+    return style
+
+
+def frame_count(fps=None):
+    """Return the number of frames in a transition window (0 if transitions are off)."""
+    if transition_style() == "none":
+        return 0
+    if fps is None:
+        fps = video_config.FPS
+    return max(1, int(round(video_config.TRANSITION_DURATION * fps)))
+
+
+def window_seconds(fps=None):
+    """Return the length of a transition window in seconds (0 if transitions are off)."""
+    if fps is None:
+        fps = video_config.FPS
+    return frame_count(fps) / fps
+
+
+def body_duration(kind, duration):
+    """
+    Return how long a slide is shown as a still before its transition.
+
+    Every slide but the outro (always last) hands its final transition
+    window over to the next slide.
+    """
+    if kind == "outro":
+        return duration
+    return duration - window_seconds()
+
+
+def ease(progress):
+    """Smoothstep easing for progress in 0-1."""
+    return progress * progress * (3 - 2 * progress)
+
+
+class TransitionRenderer:
+    """
+    Renders the frames of one transition from frame a to frame b.
+
+    The uint16 copies of both frames and the scratch buffers are
+    allocated once per transition and reused for every frame.
+    """
+
+    def __init__(self, frame_a, frame_b, style=None):
+        if frame_a.shape != frame_b.shape:
+            raise ValueError(f"Frame shapes differ: {frame_a.shape} and {frame_b.shape}")
+        self.style = style if style is not None else transition_style()
+        self.a = frame_a
+        self.b = frame_b
+        self.out = np.empty_like(frame_a)
+        if self.style in ("crossfade", "wipe"):
+            self.a16 = frame_a.astype(np.uint16)
+            self.b16 = frame_b.astype(np.uint16)
+            self.acc = np.empty(frame_a.shape, dtype=np.uint16)
+            self.tmp = np.empty(frame_a.shape, dtype=np.uint16)
+
+    def _blend(self, weight, columns=slice(None)):
+        """(a * (256 - w) + b * w + 128) >> 8 for a weight (or per-column weights) in 0-256."""
+        acc, tmp = self.acc[:, columns], self.tmp[:, columns]
+        np.multiply(self.a16[:, columns], 256 - weight, out=acc)
+        np.multiply(self.b16[:, columns], weight, out=tmp)
+        acc += tmp
+        acc += 128
+        acc >>= 8
+        self.out[:, columns] = acc
+
+    def frame(self, progress):
+        """
+        Return the transition frame at progress (0 = all a, 1 = all b).
+
+        The returned array is reused by the next call.
+        """
+        p = ease(min(max(progress, 0.0), 1.0))
+        width = self.a.shape[1]
+
+        if self.style == "crossfade":
+            self._blend(np.uint16(round(p * 256)))
+        elif self.style == "slide":
+            # b slides in from the right and pushes a out to the left
+            shift = int(round(width * p))
+            self.out[:, :width - shift] = self.a[:, shift:]
+            self.out[:, width - shift:] = self.b[:, :shift]
+        elif self.style == "wipe":
+            # A soft vertical edge moves left to right, revealing b behind it;
+            # only the columns under the edge are blended
+            edge = max(1, int(width * WIPE_EDGE))
+            position = p * (width + edge)
+            start = min(max(int(position) - edge, 0), width)
+            stop = min(max(int(np.ceil(position)), start), width)
+            self.out[:, :start] = self.b[:, :start]
+            self.out[:, stop:] = self.a[:, stop:]
+            if stop > start:
+                columns = np.arange(start, stop, dtype=np.float32)
+                weights = np.clip((position - columns) / edge, 0.0, 1.0)
+                self._blend(np.round(weights * 256).astype(np.uint16)[None, :, None], slice(start, stop))
+        else:
+            self.out[:] = self.b if p >= 0.5 else self.a
+        return self.out
+
+    def frames(self, count):
+        """Yield count frames evenly spread strictly between a and b."""
+        for n in range(count):
+            yield self.frame((n + 1) / (count + 1))
+
+
+def write_transition_segment(frame_a, frame_b, output_file, style=None, fps=None):
+    """
+    Encode the transition between two slide frames as a video segment.
+
+    Args:
+        frame_a: RGB frame of the outgoing slide
+        frame_b: RGB frame of the incoming slide
+        output_file: Path of the segment to write
+        style: Transition style (defaults to video_config.TRANSITION)
+        fps: Frame rate (defaults to video_config.FPS)
+
+    Returns:
+        str: Path of the written segment
+    """
+    if fps is None:
+        fps = video_config.FPS
+    height, width = frame_a.shape[:2]
+    renderer = TransitionRenderer(frame_a, frame_b, style)
+    process = video_segments.open_frame_pipe(output_file, width, height, fps)
+    try:
+        for frame in renderer.frames(frame_count(fps)):
+            process.stdin.write(memoryview(frame).cast("B"))
+    finally:
+        video_segments.close_frame_pipe(process)
+    return output_file
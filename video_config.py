@@ -5,11 +5,14 @@ VIDEO_WIDTH = 1280
 VIDEO_HEIGHT = 720
 FPS = 24
 SLIDE_DURATION = 4  # seconds per product
+INTRO_DURATION = 3  # seconds
+OUTRO_DURATION = 3  # seconds
 
 # Colors (RGB)
 BACKGROUND_COLOR = (15, 23, 42)  # Dark blue-gray
 GRADIENT_START = (15, 23, 42)  # Dark blue
 GRADIENT_END = (30, 41, 59)  # Slightly lighter blue
+BACKGROUND_STYLE = "linear"  # "linear", "diagonal", "radial" or "solid"
 
 # Text Colors
 TITLE_COLOR = (255, 255, 255)  # White
@@ -36,6 +39,60 @@ SAVINGS_Y_POS = 0.65  # Moved down to avoid title overlap
 BADGE_Y_POS = 0.08  # Moved up closer to top
 LINK_TEXT_Y_POS = 0.80  # Moved down slightly
 
+# Cover image on product slides (from the image cache; fractions of the screen)
+SHOW_COVER = True
+COVER_PLACEMENT = "left"  # "left" (title and savings beside it) or "top" (text below it)
+COVER_X_POS = 0.05
+COVER_Y_POS = 0.22
+COVER_WIDTH = 0.22
+COVER_HEIGHT = 0.56
+COVER_CACHE_DIR = ".cache/covers"  # Resized cover rasters reused across runs
+COVER_CACHE_MAX_BYTES = 200 * 1024 * 1024  # 200 MB
+
+# Layout scaling: font sizes, text boxes and margins are designed for this
+# resolution and scale by min(width / base width, height / base height)
+LAYOUT_BASE_WIDTH = 1280
+LAYOUT_BASE_HEIGHT = 720
+
+# Renditions: each overrides settings above; the first writes OUTPUT_FILENAME,
+# the others OUTPUT_FILENAME with their name appended
+RENDITIONS = {
+    "landscape": {},
+    "shorts": {
+        "VIDEO_WIDTH": 1080,
+        "VIDEO_HEIGHT": 1920,
+        "COVER_PLACEMENT": "top",
+        "COVER_X_POS": 0.2,
+        "COVER_Y_POS": 0.15,
+        "COVER_WIDTH": 0.6,
+        "COVER_HEIGHT": 0.3,
+        "TITLE_Y_POS": 0.48,
+        "SAVINGS_Y_POS": 0.66,
+        "BADGE_Y_POS": 0.05,
+        "LINK_TEXT_Y_POS": 0.78,
+    },
+    "square": {
+        "VIDEO_WIDTH": 1080,
+        "VIDEO_HEIGHT": 1080,
+        "COVER_PLACEMENT": "top",
+        "COVER_X_POS": 0.3,
+        "COVER_Y_POS": 0.17,
+        "COVER_WIDTH": 0.4,
+        "COVER_HEIGHT": 0.33,
+        "TITLE_Y_POS": 0.52,
+        "SAVINGS_Y_POS": 0.72,
+        "BADGE_Y_POS": 0.03,
+        "LINK_TEXT_Y_POS": 0.82,
+    },
+}
+OUTPUT_RENDITIONS = ["landscape"]  # Renditions rendered by default
+
+# Transitions between slides: "none", "crossfade", "slide" or "wipe"
+# (static and numpy render modes). The transition takes the last
+# TRANSITION_DURATION seconds of the outgoing slide, so the length is unchanged.
+TRANSITION = "crossfade"
+TRANSITION_DURATION = 0.5  # seconds
+
 # Fonts
 # MoviePy will use default fonts, but you can specify custom fonts here
 FONT_FAMILY = "Arial-Bold"  # or path to .ttf file
@@ -45,4 +102,46 @@ OUTPUT_FILENAME = "amazon_deals_video.mp4"
 CODEC = "libx264"
 AUDIO = True
 AUDIO_FILENAME = "Funk Game Loop - Kevin MacLeod.mp3"
-BITRATE = "5000k"
+AUDIO_BITRATE = "192k"
+AUDIO_CACHE_DIR = ".cache/audio"  # Looped AAC tracks reused across runs
+AUDIO_CACHE_MAX_BYTES = 50 * 1024 * 1024  # 50 MB (one track per video length)
+
+# Encoder profiles
+# Each profile sets x264 threads (0 = all cores), preset, quality (crf, or a
+# fixed bitrate when "bitrate" is set), tune and GOP length in frames.
+# "stillimage" suits slideshows: static frames cost almost nothing to encode.
+ENCODER_PROFILES = {
+    "draft": {"threads": 0, "preset": "ultrafast", "crf": 30, "bitrate": None, "tune": "stillimage", "gop": 240},
+    "upload": {"threads": 0, "preset": "veryfast", "crf": 20, "bitrate": None, "tune": "stillimage", "gop": 48},
+    "archive": {"threads": 0, "preset": "slow", "crf": 16, "bitrate": None, "tune": "stillimage", "gop": 48},
+}
+ENCODER_PROFILE = "upload"
+
+# Rendering
+# "static" composites each slide once and encodes it as a still segment,
+# "numpy" streams frames from the NumPy compositor straight into ffmpeg,
+# "streaming" renders through MoviePy but builds each slide only when it is reached,
+# "composite" renders every frame through MoviePy
+RENDER_MODE = "static"
+RENDER_WORKERS = None  # Worker processes for static rendering (None = all CPU cores)
+
+# Segment cache (reruns only re-encode slides whose content changed)
+SEGMENT_CACHE = True
+SEGMENT_CACHE_DIR = ".cache/segments"
+SEGMENT_CACHE_MAX_BYTES = 500 * 1024 * 1024  # 500 MB
+
+# Text raster cache (rendered text layers reused across slides and runs)
+TEXT_CACHE_DIR = ".cache/text"
+TEXT_CACHE_MAX_BYTES = 100 * 1024 * 1024  # 100 MB
+
+# Draft preview (python preview.py): selected slides at reduced resolution
+# and frame rate, for checking layout changes without a full render
+PREVIEW_SLIDES = 6  # Slides previewed when none are selected
+PREVIEW_SCALE = 0.5  # Fraction of the rendition's resolution
+PREVIEW_FPS = 8
+PREVIEW_ENCODER_PROFILE = "draft"
+PREVIEW_COLUMNS = 3  # Contact sheet tiles per row
+PREVIEW_FILENAME = "preview.png"
+PREVIEW_CLIP_FILENAME = "preview.mp4"
+THUMBNAIL_FILENAME = "thumbnail.jpg"  # Full-resolution YouTube thumbnail
+THUMBNAIL_QUALITY = 90  # JPEG quality
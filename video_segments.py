@@ -0,0 +1,204 @@
+"""
+Video Segment Helpers
+Encodes static slides as still-image video segments with ffmpeg and
+joins the segments into the final MP4 without re-encoding them
+"""
+
+import os
+import subprocess
+
+from moviepy.config import FFMPEG_BINARY
+import numpy as np
+
+import video_config
+
+
+def run_ffmpeg(args, input=None):
+    """
+    Run ffmpeg with the given arguments.
+
+    Args:
+        args: List of ffmpeg command line arguments (without the binary)
+        input: Optional bytes fed to ffmpeg's stdin
+
+    Raises:
+        RuntimeError: If ffmpeg exits with a non-zero status
+    """
+    cmd = [FFMPEG_BINARY, "-y", "-hide_banner", "-loglevel", "error"] + list(args)
+    result = subprocess.run(cmd, input=input, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    if result.returncode != 0:
+        raise RuntimeError(f"ffmpeg failed: {result.stderr.decode('utf-8', 'replace').strip()}")
+
+
+def encoder_settings(profile=None):
+    """
+    Look up an encoder profile from video_config.ENCODER_PROFILES.
+
+    Args:
+        profile: Profile name (defaults to video_config.ENCODER_PROFILE)
+
+    Returns:
+        dict: threads, preset, crf, bitrate, tune and gop settings
+    """
+    if profile is None:
+        profile = video_config.ENCODER_PROFILE
+    try:
+        return video_config.ENCODER_PROFILES[profile]
+    except KeyError:
+        raise ValueError(
+            f"Unknown encoder profile: {profile} "
+            f"(expected one of {', '.join(video_config.ENCODER_PROFILES)})"
+        )
+
+
+def x264_params(profile=None):
+    """Return the ffmpeg quality, tune and GOP arguments for an encoder profile."""
+    settings = encoder_settings(profile)
+    args = []
+    if not settings.get("bitrate") and settings.get("crf") is not None:
+        args += ["-crf", str(settings["crf"])]
+    if settings.get("tune"):
+        args += ["-tune", settings["tune"]]
+    if settings.get("gop"):
+        args += ["-g", str(settings["gop"])]
+    return args
+
+
+def video_encoder_args(fps=None, profile=None):
+    """Return the ffmpeg output arguments shared by every encoded video stream."""
+    if fps is None:
+        fps = video_config.FPS
+    settings = encoder_settings(profile)
+    args = [
+        "-c:v", video_config.CODEC,
+        "-preset", settings["preset"],
+        "-threads", str(settings.get("threads") or 0),
+    ]
+    if settings.get("bitrate"):
+        args += ["-b:v", settings["bitrate"]]
+    return args + x264_params(profile) + [
+        "-pix_fmt", "yuv420p",
+        "-r", str(fps),
+    ]
+
+
+def open_frame_pipe(output_file, width, height, fps=None, audio_file=None):
+    """
+    Start an ffmpeg process that encodes raw RGB frames written to its stdin.
+
+    Args:
+        output_file: Video path to write
+        width: Frame width
+        height: Frame height
+        fps: Frame rate (defaults to video_config.FPS)
+        audio_file: Optional AAC track, muxed in by stream copy
+
+    Returns:
+        subprocess.Popen: Process whose stdin accepts rgb24 frames
+    """
+    if fps is None:
+        fps = video_config.FPS
+    args = [
+        "-f", "rawvideo",
+        "-pix_fmt", "rgb24",
+        "-s", f"{width}x{height}",
+        "-framerate", str(fps),
+        "-i", "-",
+    ]
+    if audio_file:
+        args += ["-i", audio_file, "-map", "0:v", "-map", "1:a", "-c:a", "copy", "-shortest"]
+    else:
+        args += ["-an"]
+    args += video_encoder_args(fps) + ["-movflags", "+faststart", output_file]
+
+    cmd = [FFMPEG_BINARY, "-y", "-hide_banner", "-loglevel", "error"] + args
+    return subprocess.Popen(cmd, stdin=subprocess.PIPE, stderr=subprocess.PIPE)
+
+
+def close_frame_pipe(process):
+    """
+    Finish writing frames and wait for ffmpeg to exit.
+
+    Raises:
+        RuntimeError: If ffmpeg exits with a non-zero status
+    """
+    process.stdin.close()
+    stderr = process.stderr.read()
+    if process.wait() != 0:
+        raise RuntimeError(f"ffmpeg failed: {stderr.decode('utf-8', 'replace').strip()}")
+
+
+def write_still_segment(frame, duration, output_file, fps=None):
+    """
+    Encode a single frame as a still-image video segment.
+
+    The raw frame is piped to ffmpeg once, converted to YUV once and
+    repeated by the loop filter, so neither the encoder nor the decoder
+    does any per-frame work besides encoding.
+
+    Args:
+        frame: RGB frame as a uint8 array of shape (height, width, 3)
+        duration: Segment duration in seconds
+        output_file: Path of the segment to write
+        fps: Frame rate (defaults to video_config.FPS)
+
+    Returns:
+        str: Path of the written segment
+    """
+    if fps is None:
+        fps = video_config.FPS
+    height, width = frame.shape[:2]
+    frames = max(1, int(round(duration * fps)))
+
+    run_ffmpeg([
+        "-f", "rawvideo",
+        "-pix_fmt", "rgb24",
+        "-s", f"{width}x{height}",
+        "-framerate", str(fps),
+        "-i", "pipe:0",
+        "-vf", f"format=yuv420p,loop=loop={frames - 1}:size=1:start=0,setpts=N/{fps}/TB",
+    ] + video_encoder_args(fps) + [
+        "-an",
+        output_file,
+    ], input=np.ascontiguousarray(frame, dtype=np.uint8).tobytes())
+    return output_file
+
+
+def concat_segments(segment_files, output_file, audio_file=None):
+    """
+    Join encoded segments into one video by stream copy.
+
+    Args:
+        segment_files: Ordered list of segment paths (same codec and size)
+        output_file: Final video path
+        audio_file: Optional AAC track, muxed in by stream copy
+    """
+    list_file = output_file + ".segments.txt"
+    with open(list_file, 'w', encoding='utf-8') as f:
+        for segment in segment_files:
+            path = os.path.abspath(segment).replace("'", "'\\''")
+            f.write(f"file '{path}'\n")
+
+    args = ["-f", "concat", "-safe", "0", "-i", list_file]
+    if audio_file:
+        args += ["-i", audio_file, "-map", "0:v", "-map", "1:a", "-shortest"]
+    args += ["-c", "copy"]
+    args += ["-movflags", "+faststart", output_file]
+
+    try:
+        run_ffmpeg(args)
+    finally:
+        os.remove(list_file)
+
+
+def mux_audio(video_file, audio_file, output_file):
+    """Add an audio track to a video by stream copy."""
+    run_ffmpeg([
+        "-i", video_file,
+        "-i", audio_file,
+        "-map", "0:v", "-map", "1:a",
+        "-c", "copy",
+        "-shortest",
+        "-movflags", "+faststart",
+        output_file,
+    ])